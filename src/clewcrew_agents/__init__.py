@@ -15,15 +15,33 @@ All agents follow the principle of analyzing existing data and outputs
 rather than running expensive tools themselves.
 """
 
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from .base_expert import BaseExpert, HallucinationResult
-from .security_expert import SecurityExpert
-from .code_quality_expert import CodeQualityExpert
-from .devops_expert import DevOpsExpert
-from .test_expert import TestExpert
-from .architecture_expert import ArchitectureExpert
-from .build_expert import BuildExpert
-from .model_expert import ModelExpert
-from .mcp_expert import MCPExpert
+
+if TYPE_CHECKING:
+    from .architecture_expert import ArchitectureExpert
+    from .build_expert import BuildExpert
+    from .code_quality_expert import CodeQualityExpert
+    from .devops_expert import DevOpsExpert
+    from .mcp_expert import MCPExpert
+    from .model_expert import ModelExpert
+    from .security_expert import SecurityExpert
+    from .test_expert import TestExpert
+
+# Experts are imported on first access (PEP 562) so that importing the
+# package, or a single expert, does not load every other expert module
+_LAZY_EXPERTS = {
+    "SecurityExpert": ".security_expert",
+    "CodeQualityExpert": ".code_quality_expert",
+    "DevOpsExpert": ".devops_expert",
+    "TestExpert": ".test_expert",
+    "ArchitectureExpert": ".architecture_expert",
+    "BuildExpert": ".build_expert",
+    "ModelExpert": ".model_expert",
+    "MCPExpert": ".mcp_expert",
+}
 
 __all__ = [
     "BaseExpert",
@@ -39,3 +57,16 @@ __all__ = [
 ]
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPERTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    expert = getattr(import_module(module_name, __name__), name)
+    globals()[name] = expert
+    return expert
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,78 @@
+"""
+Filesystem helpers for clewcrew agents
+
+Directory traversal works on os.scandir() entries and plain strings; callers
+build Path objects only for the results they keep.
+"""
+
+import os
+from collections.abc import Callable, Iterable
+from typing import Optional
+
+from ._io import StrPath
+
+# Tool, VCS and build directories that never hold files worth analyzing
+PRUNE_DIRS = frozenset({
+    ".git", ".hg", ".tox", ".venv", "venv", "node_modules", "__pycache__",
+    "dist", "build", ".mypy_cache", ".pytest_cache", ".ruff_cache",
+})
+
+# VCS metadata and virtualenv directories, pruned at the project root by
+# walks that must not miss any source, such as the security scan
+ROOT_ONLY_PRUNE_DIRS = frozenset({".git", ".hg", ".tox", ".venv", "venv"})
+
+
+def is_pruned(dirname: str) -> bool:
+    """Return True for directories the walkers should not descend into"""
+    return dirname in PRUNE_DIRS or dirname.endswith(".egg-info")
+
+
+def list_names(path: StrPath) -> frozenset[str]:
+    """Return the entry names of a directory, or an empty set if unreadable
+
+    One getdents-backed listdir() replaces a stat() per probed name; callers
+    test membership and only stat the names that are actually present.
+    """
+    try:
+        return frozenset(os.listdir(path))
+    except OSError:
+        return frozenset()
+
+
+def walk_files(
+    root: StrPath,
+    wanted_suffixes: tuple[str, ...] = (),
+    wanted_basenames: Iterable[str] = (),
+    *,
+    prune: Optional[Callable[[str], bool]] = is_pruned,
+    prune_root_only: bool = False,
+) -> list[str]:
+    """Recursively collect files under root matching a suffix or basename
+
+    Directories for which prune(name) is true are not descended into; pass
+    prune=None to walk everything, or prune_root_only=True to apply prune to
+    the entries of root alone. Paths are returned as plain strings.
+    """
+    basenames = frozenset(wanted_basenames)
+    found: list[str] = []
+    top = os.fspath(root)
+    stack = [top]
+
+    while stack:
+        path = stack.pop()
+        try:
+            entries = os.scandir(path)
+        except OSError:
+            continue
+        check = prune if not prune_root_only or path == top else None
+        with entries:
+            for entry in entries:
+                # DirEntry caches d_type, so this does not issue a stat()
+                if entry.is_dir(follow_symlinks=False):
+                    if check is None or not check(entry.name):
+                        stack.append(entry.path)
+                elif entry.name.endswith(wanted_suffixes) or entry.name in basenames:
+                    found.append(entry.path)
+
+    return found
+
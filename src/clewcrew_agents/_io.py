@@ -0,0 +1,243 @@
+"""
+File reading helpers for clewcrew agents
+
+The expert analyzers are coroutines that may run side by side under one
+event loop, so blocking reads are pushed onto worker threads here instead
+of stalling the loop.
+"""
+
+import asyncio
+import mmap
+import os
+import re
+import sys
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any, Optional, TypeVar, Union
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+try:
+    import ijson
+except ImportError:  # optional; large JSON reports are then parsed in one go
+    ijson = None
+
+json_loads: Callable[[Union[bytes, str]], Any]
+try:
+    from orjson import loads as json_loads
+except ImportError:  # optional; the stdlib parser is slower but equivalent
+    from json import loads as json_loads
+
+# Seconds to wait for a single file read before giving up
+READ_TIMEOUT = 10.0
+
+# Read size used when streaming a file through a scanner
+CHUNK_SIZE = 64 * 1024
+
+# Buffer size for files read line by line in binary mode
+READ_BUFFER_SIZE = 1 << 20
+
+# JSON files at least this large are streamed with ijson when it is installed
+STREAM_JSON_THRESHOLD = 10 * 1024 * 1024
+
+# Number of files iter_prefetched() keeps in flight ahead of the consumer
+PREFETCH_DEPTH = 8
+
+T = TypeVar("T")
+
+# Error markers looked for in tool and build logs, matched in a single pass
+LOG_ERROR_RE = re.compile(rb"error|failed", re.IGNORECASE)
+
+# Helpers take plain strings as well as Path objects
+StrPath = Union[str, "os.PathLike[str]"]
+
+
+def _read_text(path: StrPath) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+async def read_text_async(
+    path: StrPath, timeout: float = READ_TIMEOUT
+) -> Optional[str]:
+    """Read a text file without blocking the event loop
+
+    Returns None when the file does not exist; any other error (including
+    asyncio.TimeoutError) is raised to the caller.
+    """
+    return await asyncio.wait_for(asyncio.to_thread(_read_text, path), timeout)
+
+
+def load_toml(path: StrPath) -> dict[str, Any]:
+    """Parse a TOML file"""
+    with open(path, "rb") as f:
+        data: dict[str, Any] = tomllib.load(f)
+    return data
+
+
+def file_contains_any(
+    path: StrPath, needles: Sequence[bytes], *, case_insensitive: bool = True
+) -> dict[bytes, bool]:
+    """Report which needles occur in a file without loading it into memory
+
+    The file is streamed in CHUNK_SIZE blocks, keeping enough of the previous
+    block to catch a needle split across the boundary, and reading stops as
+    soon as every needle has been seen. Case-insensitive matching is done by
+    the regex engine, so no lowered copy of a block is ever built.
+    """
+    flags = re.IGNORECASE if case_insensitive else 0
+    found = dict.fromkeys(needles, False)
+    pending = {n: re.compile(re.escape(n), flags) for n in needles}
+    overlap = max((len(n) for n in needles), default=1) - 1
+    tail = b""
+
+    with open(path, "rb") as f:
+        while pending:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            window = tail + chunk
+            for needle in [n for n, p in pending.items() if p.search(window)]:
+                found[needle] = True
+                del pending[needle]
+            tail = window[-overlap:] if overlap else b""
+
+    return found
+
+
+async def contains_any_async(
+    path: StrPath, needles: Sequence[bytes], *, case_insensitive: bool = True
+) -> Optional[dict[bytes, bool]]:
+    """Run file_contains_any() in a worker thread
+
+    Returns None when the file does not exist.
+    """
+    try:
+        return await asyncio.to_thread(
+            file_contains_any, path, needles, case_insensitive=case_insensitive
+        )
+    except FileNotFoundError:
+        return None
+
+
+def file_search(
+    path: StrPath, pattern: "re.Pattern[bytes]", *, overlap: int = 256
+) -> bool:
+    """Return True as soon as pattern matches anywhere in the file
+
+    The file is streamed in CHUNK_SIZE blocks; overlap bytes of the previous
+    block are rescanned so matches up to that length are never split.
+    """
+    tail = b""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                return False
+            window = tail + chunk
+            if pattern.search(window):
+                return True
+            tail = window[-overlap:]
+
+
+def iter_json_array(path: StrPath) -> Iterator[Any]:
+    """Yield the items of a file holding a top-level JSON array
+
+    Files of STREAM_JSON_THRESHOLD bytes or more are parsed incrementally
+    with ijson when it is available, so peak memory stays flat; smaller
+    files are parsed in one call, with orjson when it is installed.
+    """
+    with open(path, "rb") as f:
+        if ijson is not None and os.fstat(f.fileno()).st_size >= STREAM_JSON_THRESHOLD:
+            yield from ijson.items(f, "item", use_float=True)
+        else:
+            yield from json_loads(f.read())
+
+
+@contextmanager
+def map_file(path: StrPath) -> Iterator[Union[mmap.mmap, bytes]]:
+    """Map a file read-only so it can be searched without copying it
+
+    Regex and substring searches run directly over the page cache, and the
+    kernel is told to read ahead since scans go front to back. Empty files
+    cannot be mapped and are presented as b"".
+    """
+    with open(path, "rb") as f:
+        try:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            yield b""
+            return
+        with mapping:
+            if hasattr(mapping, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapping.madvise(mmap.MADV_SEQUENTIAL)
+            yield mapping
+
+
+def mapped_search(path: StrPath, pattern: "re.Pattern[bytes]") -> bool:
+    """Return True if pattern matches anywhere in the memory-mapped file"""
+    with map_file(path) as data:
+        return pattern.search(data) is not None
+
+
+def file_match_groups(path: StrPath, pattern: "re.Pattern[bytes]") -> set[str]:
+    """Return the names of the groups in pattern that match anywhere in a file
+
+    pattern is an alternation of named groups, so one finditer() pass over
+    the raw bytes replaces a separate substring test per keyword; the scan
+    stops once every group has matched.
+    """
+    found: set[str] = set()
+    with map_file(path) as data:
+        for match in pattern.finditer(data):
+            if match.lastgroup is None:
+                continue
+            found.add(match.lastgroup)
+            if len(found) == len(pattern.groupindex):
+                break
+    return found
+
+
+async def iter_prefetched(
+    paths: Iterable[StrPath],
+    func: Callable[[StrPath], T],
+    *,
+    concurrency: int = PREFETCH_DEPTH,
+) -> AsyncIterator[tuple[StrPath, Any]]:
+    """Yield (path, func(path)) in order while later files are already being read
+
+    A producer task starts func on worker threads up to concurrency files
+    ahead of the consumer, so the read of the next file overlaps the
+    processing of the current one. As with gather(return_exceptions=True),
+    an exception raised by func is yielded in place of its result.
+    """
+    queue: "asyncio.Queue[Optional[tuple[StrPath, asyncio.Future[T]]]]"
+    queue = asyncio.Queue(maxsize=concurrency)
+
+    async def produce() -> None:
+        for path in paths:
+            future = asyncio.ensure_future(asyncio.to_thread(func, path))
+            await queue.put((path, future))
+        await queue.put(None)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while (item := await queue.get()) is not None:
+            path, future = item
+            try:
+                result: Any = await future
+            except Exception as e:
+                result = e
+            yield path, result
+    finally:
+        producer.cancel()
+        while not queue.empty():
+            item = queue.get_nowait()
+            if item is not None:
+                item[1].cancel()
@@ -6,22 +6,86 @@ CRITICAL: This agent analyzes existing architecture documentation and code struc
 It does NOT run expensive analysis tools.
 """
 
+import asyncio
+import os
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from itertools import chain
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
-from .base_expert import BaseExpert, HallucinationResult
+from ._fs import is_pruned
+from ._io import contains_any_async, read_text_async
+from .base_expert import (
+    PRIORITY_LOW,
+    PRIORITY_MEDIUM,
+    BaseExpert,
+    Finding,
+    HallucinationResult,
+)
+
+# Literal names probed at the project root; none of them contain wildcards
+_LITERAL_FILE_CANDIDATES = (
+    "README.md", "ARCHITECTURE.md", "DESIGN.md",
+    "pyproject.toml", "setup.py", "requirements.txt",
+)
+
+# Top-level directories holding architecture docs and source code
+_DOC_DIRS = frozenset({"docs", "adr", "decisions", "architecture", "design"})
+_CODE_DIRS = frozenset({"src", "lib", "app", "core"})
+_LITERAL_DIR_CANDIDATES = _DOC_DIRS | _CODE_DIRS
+
+# Fix suggested for each finding type: (fix, source)
+_FIX_TEMPLATES = {
+    "documentation_issue": ("Improve architecture documentation", "existing_docs"),
+    "structure_issue": ("Improve code structure", "existing_structure"),
+    "dependency_issue": ("Fix dependency management", "existing_config"),
+}
+
+
+def _is_design_doc_name(name: str) -> bool:
+    lowered = name.lower()
+    return "architecture" in lowered or "design" in lowered
+
+
+@dataclass
+class ProjectIndex:
+    """Files of interest collected in a single walk of the project tree"""
+
+    # Entry names directly under the project root, from the walk's first listing
+    top_files: frozenset[str] = frozenset()
+    top_dirs: frozenset[str] = frozenset()
+    md_files: list[str] = field(default_factory=list)
+    py_files: list[str] = field(default_factory=list)
+    # Whether any name under docs/ mentions architecture or design
+    has_design_docs: bool = False
+    py_parent_dirs: set[str] = field(default_factory=set)
+    init_dirs: set[str] = field(default_factory=set)
+    # Only counted across the whole tree for flat (non-src) layouts
+    total_py_files: int = 0
 
 
 class ArchitectureExpert(BaseExpert):
     """Architecture expert that analyzes existing documentation and code structure"""
 
+    # Not wrapped in cached_scan: the scan walks the whole tree, so no cheap
+    # key can tell when a file under docs/ or a source package changed
     async def detect_hallucinations(self, project_path: Path) -> HallucinationResult:
         """Analyze existing architecture data and provide recommendations"""
+        # Walk the project once, off the event loop, and share the result
+        # between the analyzers
+        index = await asyncio.to_thread(self._collect_project_index, project_path)
+        return await self._detect_with_index(project_path, index)
+
+    async def _detect_with_index(
+        self, project_path: Path, index: ProjectIndex
+    ) -> HallucinationResult:
+        """Run detect_hallucinations against an already collected index"""
         hallucinations = []
         recommendations = []
 
         # Look for existing architecture documentation and structure
-        arch_data = await self._find_existing_architecture_data(project_path)
+        arch_data = await self._find_existing_architecture_data(project_path, index)
         
         if not arch_data:
             recommendations = [
@@ -36,16 +100,15 @@ class ArchitectureExpert(BaseExpert):
                 recommendations=recommendations
             )
 
-        # Analyze architecture documentation
-        doc_issues = await self._analyze_architecture_docs(project_path)
+        # Analyze docs, code structure and dependencies; the analyzers are
+        # independent, so their file reads overlap
+        doc_issues, structure_issues, dependency_issues = await asyncio.gather(
+            self._analyze_architecture_docs(project_path, index),
+            self._analyze_code_structure(project_path, index),
+            self._analyze_dependencies(project_path),
+        )
         hallucinations.extend(doc_issues)
-
-        # Analyze code structure
-        structure_issues = await self._analyze_code_structure(project_path)
         hallucinations.extend(structure_issues)
-
-        # Analyze dependency configuration
-        dependency_issues = await self._analyze_dependencies(project_path)
         hallucinations.extend(dependency_issues)
 
         # Generate recommendations based on existing data
@@ -84,10 +147,12 @@ class ArchitectureExpert(BaseExpert):
         Returns:
             Dictionary containing architecture quality metrics
         """
-        result = await self.detect_hallucinations(project_path)
+        # Walk the project once for both the detection and the score
+        index = await asyncio.to_thread(self._collect_project_index, project_path)
+        result = await self._detect_with_index(project_path, index)
         
         # Calculate architecture quality score based on existing data
-        arch_data = await self._find_existing_architecture_data(project_path)
+        arch_data = await self._find_existing_architecture_data(project_path, index)
         
         if not arch_data:
             # No architecture documentation
@@ -172,187 +237,202 @@ class ArchitectureExpert(BaseExpert):
         """Get the weight of the architecture quality metric."""
         return 1.0
 
-    async def _find_existing_architecture_data(self, project_path: Path) -> list[Path]:
+    def _collect_project_index(self, project_path: Path) -> ProjectIndex:
+        """Walk the project tree once, classifying every file we care about"""
+        index = ProjectIndex()
+        root = os.fspath(project_path)
+
+        for dirpath, dirnames, filenames in os.walk(root):
+            # Top-level directory this entry lives under ("" for the root)
+            if dirpath == root:
+                top = ""
+            else:
+                top = os.path.relpath(dirpath, root).partition(os.sep)[0]
+
+            if dirpath == root:
+                index.top_files = frozenset(filenames)
+                index.top_dirs = frozenset(dirnames)
+
+            # With a src/ layout only the candidate directories matter; a flat
+            # layout needs the whole tree for its .py file count
+            if dirpath == root and "src" in dirnames:
+                dirnames[:] = [d for d in dirnames if d in _LITERAL_DIR_CANDIDATES]
+            else:
+                dirnames[:] = [d for d in dirnames if not is_pruned(d)]
+
+            # One substring pass per directory, skipped after the first hit
+            if top == "docs" and not index.has_design_docs:
+                index.has_design_docs = any(
+                    _is_design_doc_name(name) for name in chain(dirnames, filenames)
+                )
+
+            for name in filenames:
+                if name.endswith(".py"):
+                    index.total_py_files += 1
+                    if top in _CODE_DIRS:
+                        index.py_files.append(os.path.join(dirpath, name))
+                    if top == "src":
+                        index.py_parent_dirs.add(dirpath)
+                        if name == "__init__.py":
+                            index.init_dirs.add(dirpath)
+                elif name.endswith(".md") and top in _DOC_DIRS:
+                    index.md_files.append(os.path.join(dirpath, name))
+
+        return index
+
+    async def _find_existing_architecture_data(
+        self, project_path: Path, index: Optional[ProjectIndex] = None
+    ) -> list[Path]:
         """Find existing architecture documentation and structure files"""
-        arch_files = []
-        
-        # Architecture documentation
-        doc_files = [
-            "README.md", "ARCHITECTURE.md", "DESIGN.md", "docs/",
-            "adr/", "decisions/", "architecture/", "design/"
-        ]
-        
-        for doc_file in doc_files:
-            file_path = project_path / doc_file
-            if file_path.exists():
-                if file_path.is_dir():
-                    arch_files.extend(file_path.rglob("*.md"))
-                else:
-                    arch_files.append(file_path)
-        
-        # Code structure files
-        structure_files = [
-            "pyproject.toml", "setup.py", "requirements.txt",
-            "src/", "lib/", "app/", "core/"
+        if index is None:
+            index = self._collect_project_index(project_path)
+        root = os.fspath(project_path)
+
+        # Literal candidates are checked against the root listing, no stat()
+        arch_files = [
+            Path(os.path.join(root, name))
+            for name in _LITERAL_FILE_CANDIDATES
+            if name in index.top_files
         ]
-        
-        for structure_file in structure_files:
-            file_path = project_path / structure_file
-            if file_path.exists():
-                if file_path.is_dir():
-                    arch_files.extend(file_path.rglob("*.py"))
-                else:
-                    arch_files.append(file_path)
+
+        # Candidate directories were only descended into when they exist
+        arch_files.extend(Path(p) for p in index.md_files)
+        arch_files.extend(Path(p) for p in index.py_files)
         
         return arch_files
 
-    async def _analyze_architecture_docs(self, project_path: Path) -> list[dict[str, Any]]:
+    async def _analyze_architecture_docs(
+        self, project_path: Path, index: ProjectIndex
+    ) -> list[Finding]:
         """Analyze existing architecture documentation"""
         issues = []
         
         # Check for README
-        readme_file = project_path / "README.md"
-        if readme_file.exists():
-            try:
-                with open(readme_file, 'r') as f:
-                    content = f.read()
-                    if "architecture" not in content.lower() and "design" not in content.lower():
-                        issues.append({
-                            "type": "documentation_issue",
-                            "file": str(readme_file),
-                            "description": "README missing architecture/design section",
-                            "priority": "medium",
-                            "tool": "documentation",
-                            "source": "existing_docs"
-                        })
-            except Exception as e:
-                self.logger.warning(f"Could not read {readme_file}: {e}")
+        root = os.fspath(project_path)
+        readme_file = os.path.join(root, "README.md")
+        try:
+            found = await contains_any_async(readme_file, (b"architecture", b"design"))
+            if found is not None and not any(found.values()):
+                issues.append(Finding(
+                    type="documentation_issue",
+                    file=readme_file,
+                    description="README missing architecture/design section",
+                    priority=PRIORITY_MEDIUM,
+                    tool="documentation",
+                    source="existing_docs",
+                ))
+        except Exception as e:
+            self.logger.warning(f"Could not read {readme_file}: {e}")
         
         # Check for architecture docs directory
-        docs_dir = project_path / "docs"
-        if docs_dir.exists():
-            arch_docs = list(docs_dir.rglob("*architecture*"))
-            arch_docs.extend(docs_dir.rglob("*design*"))
-            if not arch_docs:
-                issues.append({
-                    "type": "documentation_issue",
-                    "file": str(docs_dir),
-                    "description": "Docs directory missing architecture/design documentation",
-                    "priority": "medium",
-                    "tool": "documentation",
-                    "source": "existing_docs"
-                })
+        docs_dir = os.path.join(root, "docs")
+        if "docs" in index.top_dirs:
+            if not index.has_design_docs:
+                issues.append(Finding(
+                    type="documentation_issue",
+                    file=docs_dir,
+                    description="Docs directory missing architecture/design documentation",
+                    priority=PRIORITY_MEDIUM,
+                    tool="documentation",
+                    source="existing_docs",
+                ))
         
         return issues
 
-    async def _analyze_code_structure(self, project_path: Path) -> list[dict[str, Any]]:
+    async def _analyze_code_structure(
+        self, project_path: Path, index: ProjectIndex
+    ) -> list[Finding]:
         """Analyze existing code structure"""
         issues = []
         
         # Check for src directory structure
-        src_dir = project_path / "src"
-        if src_dir.exists():
-            # Check for proper package structure
-            py_files = list(src_dir.rglob("*.py"))
-            if py_files:
-                # Check for __init__.py files
-                init_files = list(src_dir.rglob("__init__.py"))
-                if len(init_files) < len(set(f.parent for f in py_files)):
-                    issues.append({
-                        "type": "structure_issue",
-                        "file": str(src_dir),
-                        "description": "Some Python packages missing __init__.py files",
-                        "priority": "medium",
-                        "tool": "code_structure",
-                        "source": "existing_structure"
-                    })
+        root = os.fspath(project_path)
+        src_dir = os.path.join(root, "src")
+        if "src" in index.top_dirs:
+            # Check for proper package structure: every directory holding
+            # Python files should have an __init__.py
+            missing = index.py_parent_dirs - index.init_dirs
+            if missing:
+                packages = ", ".join(sorted(os.path.relpath(d, src_dir) for d in missing))
+                issues.append(Finding(
+                    type="structure_issue",
+                    file=src_dir,
+                    description=f"Some Python packages missing __init__.py files: {packages}",
+                    priority=PRIORITY_MEDIUM,
+                    tool="code_structure",
+                    source="existing_structure",
+                ))
         else:
             # Check for flat structure
-            py_files = list(project_path.rglob("*.py"))
-            if len(py_files) > 10:  # Arbitrary threshold
-                issues.append({
-                    "type": "structure_issue",
-                    "file": str(project_path),
-                    "description": "Consider organizing code into src/ directory structure",
-                    "priority": "low",
-                    "tool": "code_structure",
-                    "source": "existing_structure"
-                })
+            if index.total_py_files > 10:  # Arbitrary threshold
+                issues.append(Finding(
+                    type="structure_issue",
+                    file=root,
+                    description="Consider organizing code into src/ directory structure",
+                    priority=PRIORITY_LOW,
+                    tool="code_structure",
+                    source="existing_structure",
+                ))
         
         return issues
 
-    async def _analyze_dependencies(self, project_path: Path) -> list[dict[str, Any]]:
+    async def _analyze_dependencies(self, project_path: Path) -> list[Finding]:
         """Analyze existing dependency configuration"""
         issues = []
         
+        root = os.fspath(project_path)
+
         # Check pyproject.toml
-        pyproject_file = project_path / "pyproject.toml"
-        if pyproject_file.exists():
-            try:
-                with open(pyproject_file, 'r') as f:
-                    content = f.read()
-                    if "dependencies" in content:
-                        # Check for version pinning
-                        if ">=" in content and "==" not in content:
-                            issues.append({
-                                "type": "dependency_issue",
-                                "file": str(pyproject_file),
-                                "description": "Consider pinning dependency versions for reproducibility",
-                                "priority": "medium",
-                                "tool": "dependency_management",
-                                "source": "existing_config"
-                            })
-            except Exception as e:
-                self.logger.warning(f"Could not read {pyproject_file}: {e}")
+        pyproject_file = os.path.join(root, "pyproject.toml")
+        try:
+            data = await self._load_pyproject(project_path)
+            dependencies = data.get("project", {}).get("dependencies", []) if data else []
+            # Check for version pinning
+            if any(">=" in d and "==" not in d for d in dependencies):
+                issues.append(Finding(
+                    type="dependency_issue",
+                    file=pyproject_file,
+                    description="Consider pinning dependency versions for reproducibility",
+                    priority=PRIORITY_MEDIUM,
+                    tool="dependency_management",
+                    source="existing_config",
+                ))
+        except Exception as e:
+            self.logger.warning(f"Could not parse {pyproject_file}: {e}")
         
         # Check requirements.txt
-        requirements_file = project_path / "requirements.txt"
-        if requirements_file.exists():
-            try:
-                with open(requirements_file, 'r') as f:
-                    content = f.read()
-                    if ">=" in content and "==" not in content:
-                        issues.append({
-                            "type": "dependency_issue",
-                            "file": str(requirements_file),
-                            "description": "Consider pinning dependency versions for reproducibility",
-                            "priority": "medium",
-                            "tool": "dependency_management",
-                            "source": "existing_config"
-                        })
-            except Exception as e:
-                self.logger.warning(f"Could not read {requirements_file}: {e}")
+        requirements_file = os.path.join(root, "requirements.txt")
+        try:
+            content = await read_text_async(requirements_file)
+            if content is not None and ">=" in content and "==" not in content:
+                issues.append(Finding(
+                    type="dependency_issue",
+                    file=requirements_file,
+                    description="Consider pinning dependency versions for reproducibility",
+                    priority=PRIORITY_MEDIUM,
+                    tool="dependency_management",
+                    source="existing_config",
+                ))
+        except Exception as e:
+            self.logger.warning(f"Could not read {requirements_file}: {e}")
         
         return issues
 
-    async def suggest_fixes(self, issues: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    async def suggest_fixes(self, issues: list[Mapping[str, Any]]) -> list[dict[str, Any]]:
         """Suggest fixes based on existing architecture data"""
         fixes = []
 
         for issue in issues:
-            if issue["type"] == "documentation_issue":
-                fixes.append({
-                    "issue": issue,
-                    "fix": "Improve architecture documentation",
-                    "description": issue["description"],
-                    "priority": issue["priority"],
-                    "source": "existing_docs"
-                })
-            elif issue["type"] == "structure_issue":
-                fixes.append({
-                    "issue": issue,
-                    "fix": "Improve code structure",
-                    "description": issue["description"],
-                    "priority": issue["priority"],
-                    "source": "existing_structure"
-                })
-            elif issue["type"] == "dependency_issue":
-                fixes.append({
-                    "issue": issue,
-                    "fix": "Fix dependency management",
-                    "description": issue["description"],
-                    "priority": issue["priority"],
-                    "source": "existing_config"
-                })
+            template = _FIX_TEMPLATES.get(issue["type"])
+            if template is None:
+                continue
+            fix, source = template
+            fixes.append({
+                "issue": issue,
+                "fix": fix,
+                "description": issue["description"],
+                "priority": issue["priority"],
+                "source": source
+            })
 
         return fixes
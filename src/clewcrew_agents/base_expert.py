@@ -10,22 +10,166 @@ CRITICAL REQUIREMENTS:
 - This is a FUNDAMENTAL principle - do not violate it
 """
 
+import asyncio
+import functools
 import logging
+import os
+import sys
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine, Iterator, Mapping, Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass, fields, replace
+from itertools import chain
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional, TypeVar
+
+from ._io import load_toml
+
+# Maximum number of (project, mtime) scan results, and of parsed files, kept
+# per expert
+SCAN_CACHE_SIZE = 64
+
+# Finding priorities; interned so every finding shares one object per level
+PRIORITY_LOW = sys.intern("low")
+PRIORITY_MEDIUM = sys.intern("medium")
+PRIORITY_HIGH = sys.intern("high")
+PRIORITY_CRITICAL = sys.intern("critical")
+
+# Confidence reported when an analysis finds no issues
+NO_FINDINGS_CONFIDENCE = 0.9
+
+# Root and files walked while building the cache key of the running scan, so
+# the scan itself can reuse the walk instead of repeating it
+_scan_walked: ContextVar[Optional[tuple[str, tuple[str, ...]]]] = ContextVar(
+    "_scan_walked", default=None
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _field_names(cls: type) -> tuple[str, ...]:
+    return tuple(f.name for f in fields(cls))
+
+
+class Record(Mapping[str, Any]):
+    """Slotted dataclass record that also reads like the dict it replaces
+
+    Findings used to be plain dicts; exposing the dataclass fields through
+    the Mapping protocol keeps finding["type"], finding.get("priority") and
+    dict(finding) working for existing callers. Subclasses are declared with
+    eq=False so Mapping.__eq__ applies and a record equals its dict. Convert
+    with to_dict() before handing records to a serializer such as json.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _field_names(type(self)):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_field_names(type(self)))
+
+    def __len__(self) -> int:
+        return len(_field_names(type(self)))
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Frozen slotted instances cannot be restored through setattr
+        return type(self), tuple(getattr(self, name) for name in self)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the record as a plain dict, e.g. for serialization"""
+        return {name: getattr(self, name) for name in self}
+
+
+@dataclass(frozen=True, eq=False)
+class Finding(Record):
+    """A single issue reported by an expert"""
+
+    __slots__ = ("type", "file", "description", "priority", "tool", "source")
+
+    type: str
+    file: str
+    description: str
+    priority: str
+    tool: str
+    source: str
+
+
+@dataclass(frozen=True, eq=False)
+class LintFinding(Finding):
+    """A finding that points at a specific line reported by a linter"""
+
+    __slots__ = ("line", "column", "code")
+
+    line: int
+    column: int
+    code: str
 
 
 @dataclass
 class HallucinationResult:
     """Result from hallucination detection"""
 
-    hallucinations: list[dict[str, Any]]
+    hallucinations: Sequence[Mapping[str, Any]]
     confidence: float
     recommendations: list[str]
 
 
+T = TypeVar("T")
+E = TypeVar("E", bound="BaseExpert")
+
+
+def _copy_result(result: HallucinationResult) -> HallucinationResult:
+    # Findings are frozen records, so copying the lists is enough to keep
+    # callers from changing a cached result
+    return replace(
+        result,
+        hallucinations=list(result.hallucinations),
+        recommendations=list(result.recommendations),
+    )
+
+
+def cached_scan(
+    method: Callable[[E, Path], Coroutine[Any, Any, HallucinationResult]],
+) -> Callable[[E, Path], Coroutine[Any, Any, HallucinationResult]]:
+    """Memoize detect_hallucinations on the state of the files it reads
+
+    The key is the resolved project path, the st_mtime_ns of the project
+    directory (which moves when a root entry is added or removed) and the
+    mtime and size of pyproject.toml, of every file the expert lists in
+    _scan_inputs and of the files _scan_walk_inputs finds. Experts that walk
+    the whole project tree cannot be keyed this way and must not use it.
+    Every call gets its own copy of the result.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self: E, project_path: Path) -> HallucinationResult:
+        project_path = Path(project_path)
+        try:
+            key = await asyncio.to_thread(self._scan_cache_key, project_path)
+        except OSError:
+            return await method(self, project_path)
+
+        cached = self._scan_cache.get(key)
+        if cached is not None:
+            self._scan_cache.move_to_end(key)
+            return _copy_result(cached)
+
+        token = _scan_walked.set((os.fspath(project_path), key[2]))
+        try:
+            result = await method(self, project_path)
+        finally:
+            _scan_walked.reset(token)
+        self._scan_cache[key] = _copy_result(result)
+        if len(self._scan_cache) > SCAN_CACHE_SIZE:
+            self._scan_cache.popitem(last=False)
+        return result
+
+    return wrapper
+
+
 class BaseExpert(ABC):
     """Base class for all expert agents
     
@@ -33,9 +177,18 @@ class BaseExpert(ABC):
     they do NOT run expensive tools. All agents must follow this principle.
     """
 
+    # Root-relative files whose changes must also invalidate a cached scan
+    _scan_inputs: tuple[str, ...] = ()
+
     def __init__(self) -> None:
         self.logger = logging.getLogger(self.__class__.__name__)
         self.component_name = self.__class__.__name__
+        self._scan_cache: OrderedDict[tuple[Any, ...], HallucinationResult] = (
+            OrderedDict()
+        )
+        self._file_cache: OrderedDict[
+            tuple[Any, ...], tuple[tuple[int, int], asyncio.Future[Any]]
+        ] = OrderedDict()
 
     @abstractmethod
     async def detect_hallucinations(self, project_path: Path) -> HallucinationResult:
@@ -49,6 +202,80 @@ class BaseExpert(ABC):
         """
         pass
 
+    def clear_scan_cache(self) -> None:
+        """Forget all memoized detect_hallucinations results"""
+        self._scan_cache.clear()
+        self._file_cache.clear()
+
+    def _scan_cache_key(self, project_path: Path) -> tuple[Any, ...]:
+        """Build the scan cache key for a project"""
+        root = os.fspath(project_path)
+        mtime_ns = os.stat(root).st_mtime_ns
+        names = ("pyproject.toml", *self._scan_inputs)
+        walked = self._scan_walk_inputs(root)
+        inputs: list[Optional[tuple[int, int]]] = []
+        for path in chain((os.path.join(root, name) for name in names), walked):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                inputs.append(None)
+            else:
+                inputs.append((st.st_mtime_ns, st.st_size))
+        return (str(project_path.resolve()), mtime_ns, tuple(walked), *inputs)
+
+    def _scan_walk_inputs(self, root: str) -> list[str]:
+        """Return files below the root that the scan reads, for the cache key
+
+        Experts that walk subdirectories for their inputs override this;
+        files listed in _scan_inputs need not be repeated.
+        """
+        return []
+
+    def _walked_inputs(self, project_path: Path) -> Optional[list[str]]:
+        """Return the files the cache key walked for, None outside a scan"""
+        walked = _scan_walked.get()
+        if walked is None or walked[0] != os.fspath(project_path):
+            return None
+        return list(walked[1])
+
+    async def _read_cached(self, path: Any, parse: Callable[..., T], *args: Any) -> T:
+        """Run parse(path, *args) on a worker thread, memoized per file
+
+        The result is kept until the file's mtime or size changes, so it must
+        not be mutated by the caller. Concurrent callers asking for the same
+        file share one read. Only the SCAN_CACHE_SIZE most recently used
+        files are kept. FileNotFoundError is raised as usual.
+        """
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        key = (os.fspath(path), parse, args)
+        cached = self._file_cache.get(key)
+        future: asyncio.Future[T]
+        if cached is not None and cached[0] == stamp:
+            future = cached[1]
+            self._file_cache.move_to_end(key)
+        else:
+            future = asyncio.ensure_future(asyncio.to_thread(parse, path, *args))
+            self._file_cache[key] = (stamp, future)
+            self._file_cache.move_to_end(key)
+            if len(self._file_cache) > SCAN_CACHE_SIZE:
+                self._file_cache.popitem(last=False)
+
+        try:
+            return await future
+        except Exception:
+            # Do not keep failures around; the next call retries the read
+            if self._file_cache.get(key, (None, None))[1] is future:
+                del self._file_cache[key]
+            raise
+
+    async def _load_pyproject(self, project_path: Path) -> Optional[dict[str, Any]]:
+        """Parse the project's pyproject.toml, None when there is none"""
+        try:
+            return await self._read_cached(project_path / "pyproject.toml", load_toml)
+        except FileNotFoundError:
+            return None
+
     async def validate_findings(self, findings: list[dict[str, Any]]) -> dict[str, Any]:
         """Validate findings from hallucination detection"""
         return {"validated": True, "confidence": 0.8, "findings_count": len(findings)}
@@ -61,19 +288,22 @@ class BaseExpert(ABC):
             "success_count": 0,
         }
 
-    def calculate_confidence(self, findings: list[dict[str, Any]]) -> float:
+    def calculate_confidence(self, findings: Sequence[Mapping[str, Any]]) -> float:
         """Calculate confidence score based on findings"""
         if not findings:
-            return 0.9  # High confidence when no issues found
+            return NO_FINDINGS_CONFIDENCE  # High confidence when no issues found
 
         # Base confidence decreases with more findings
         base_confidence = 0.8
 
-        # Adjust based on severity
-        high_priority = len([f for f in findings if f.get("priority") == "high"])
-        critical_priority = len(
-            [f for f in findings if f.get("priority") == "critical"]
-        )
+        # Adjust based on severity, counted in a single pass
+        high_priority = critical_priority = 0
+        for finding in findings:
+            priority = finding.get("priority")
+            if priority == PRIORITY_HIGH:
+                high_priority += 1
+            elif priority == PRIORITY_CRITICAL:
+                critical_priority += 1
 
         # Penalize for high/critical issues
         confidence = base_confidence - (high_priority * 0.1) - (critical_priority * 0.2)
@@ -6,15 +6,54 @@ CRITICAL: This agent analyzes existing build configuration and logs.
 It does NOT run expensive build tools.
 """
 
+import asyncio
+import functools
+import os
+from collections.abc import Mapping
 from pathlib import Path
 from typing import Any
 
-from .base_expert import BaseExpert, HallucinationResult
+from ._fs import list_names
+from ._io import LOG_ERROR_RE, file_search, iter_prefetched
+from .base_expert import (
+    PRIORITY_HIGH,
+    PRIORITY_MEDIUM,
+    BaseExpert,
+    Finding,
+    HallucinationResult,
+    cached_scan,
+)
+
+# Build configuration files probed at the project root
+_BUILD_CONFIG_FILES = (
+    "pyproject.toml", "setup.py", "setup.cfg", "build.py",
+    "Makefile", "dockerfile", "Dockerfile",
+)
+
+# Build output directories; *.egg-info is matched by suffix
+_BUILD_OUTPUT_DIRS = frozenset({"build", "dist", "target"})
+
+# Build logs looked for at the project root
+_BUILD_LOG_FILES = ("build.log", "make.log", "docker.log")
+
+# Fix suggested for each finding type: (fix, description, source); a None
+# description reuses the finding's own
+_FIX_TEMPLATES = {
+    "build_config_issue": ("Fix build configuration", None, "existing_config"),
+    "build_failure": (
+        "Fix build failures",
+        "Review and fix the build failures identified in logs",
+        "existing_logs",
+    ),
+}
 
 
 class BuildExpert(BaseExpert):
     """Build expert that analyzes existing build configuration and logs"""
 
+    _scan_inputs = _BUILD_LOG_FILES
+
+    @cached_scan
     async def detect_hallucinations(self, project_path: Path) -> HallucinationResult:
         """Analyze existing build data and provide recommendations"""
         hallucinations = []
@@ -36,12 +75,12 @@ class BuildExpert(BaseExpert):
                 recommendations=recommendations
             )
 
-        # Analyze build configuration
-        config_issues = await self._analyze_build_config(project_path)
+        # Analyze build configuration and logs concurrently
+        config_issues, log_issues = await asyncio.gather(
+            self._analyze_build_config(project_path),
+            self._analyze_build_logs(project_path),
+        )
         hallucinations.extend(config_issues)
-
-        # Analyze build logs
-        log_issues = await self._analyze_build_logs(project_path)
         hallucinations.extend(log_issues)
 
         # Generate recommendations based on existing data
@@ -170,97 +209,85 @@ class BuildExpert(BaseExpert):
     async def _find_existing_build_data(self, project_path: Path) -> list[Path]:
         """Find existing build configuration and log files"""
         build_files = []
-        
+        root = os.fspath(project_path)
+        top = list_names(root)
+
         # Build configuration files
-        config_files = [
-            "pyproject.toml", "setup.py", "setup.cfg", "build.py",
-            "Makefile", "dockerfile", "Dockerfile"
-        ]
-        
-        for config_file in config_files:
-            file_path = project_path / config_file
-            if file_path.exists():
-                build_files.append(file_path)
-        
+        for config_file in _BUILD_CONFIG_FILES:
+            if config_file in top:
+                build_files.append(os.path.join(root, config_file))
+
         # Build output directories
-        output_dirs = ["build/", "dist/", "*.egg-info/", "target/"]
-        for output_dir in output_dirs:
-            dir_path = project_path / output_dir
-            if dir_path.exists():
-                build_files.append(dir_path)
+        for name in sorted(top):
+            if name in _BUILD_OUTPUT_DIRS or name.endswith(".egg-info"):
+                build_files.append(os.path.join(root, name))
         
-        return build_files
+        return [Path(path) for path in build_files]
 
-    async def _analyze_build_config(self, project_path: Path) -> list[dict[str, Any]]:
+    async def _analyze_build_config(self, project_path: Path) -> list[Finding]:
         """Analyze existing build configuration files"""
         issues = []
         
         # Check pyproject.toml
-        pyproject_file = project_path / "pyproject.toml"
-        if pyproject_file.exists():
-            try:
-                with open(pyproject_file, 'r') as f:
-                    content = f.read()
-                    if "build-system" not in content:
-                        issues.append({
-                            "type": "build_config_issue",
-                            "file": str(pyproject_file),
-                            "description": "Missing build-system configuration",
-                            "priority": "medium",
-                            "tool": "build_config",
-                            "source": "existing_config"
-                        })
-            except Exception as e:
-                self.logger.warning(f"Could not read {pyproject_file}: {e}")
+        pyproject_file = os.path.join(os.fspath(project_path), "pyproject.toml")
+        try:
+            data = await self._load_pyproject(project_path)
+            if data is not None and "build-system" not in data:
+                issues.append(Finding(
+                    type="build_config_issue",
+                    file=pyproject_file,
+                    description="Missing build-system configuration",
+                    priority=PRIORITY_MEDIUM,
+                    tool="build_config",
+                    source="existing_config",
+                ))
+        except Exception as e:
+            self.logger.warning(f"Could not parse {pyproject_file}: {e}")
         
         return issues
 
-    async def _analyze_build_logs(self, project_path: Path) -> list[dict[str, Any]]:
+    async def _analyze_build_logs(self, project_path: Path) -> list[Finding]:
         """Analyze existing build logs"""
         issues = []
         
-        # Look for build log files
-        log_files = ["build.log", "make.log", "docker.log"]
-        for log_file in log_files:
-            log_path = project_path / log_file
-            if log_path.exists():
-                try:
-                    with open(log_path, 'r') as f:
-                        content = f.read()
-                        if "error" in content.lower() or "failed" in content.lower():
-                            issues.append({
-                                "type": "build_failure",
-                                "file": str(log_path),
-                                "description": "Build log contains error or failure messages",
-                                "priority": "high",
-                                "tool": "build_logs",
-                                "source": "existing_logs"
-                            })
-                except Exception as e:
-                    self.logger.warning(f"Could not read {log_path}: {e}")
+        # Look for build log files, searching the next one while the
+        # current result is handled
+        root = os.fspath(project_path)
+        top = list_names(root)
+        log_paths = [os.path.join(root, name) for name in _BUILD_LOG_FILES if name in top]
+        search = functools.partial(file_search, pattern=LOG_ERROR_RE)
+        async for log_path, result in iter_prefetched(log_paths, search):
+            if isinstance(result, FileNotFoundError):
+                continue
+            if isinstance(result, Exception):
+                self.logger.warning(f"Could not read {log_path}: {result}")
+            elif result:
+                issues.append(Finding(
+                    type="build_failure",
+                    file=os.fspath(log_path),
+                    description="Build log contains error or failure messages",
+                    priority=PRIORITY_HIGH,
+                    tool="build_logs",
+                    source="existing_logs",
+                ))
         
         return issues
 
-    async def suggest_fixes(self, issues: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    async def suggest_fixes(self, issues: list[Mapping[str, Any]]) -> list[dict[str, Any]]:
         """Suggest fixes based on existing build data"""
         fixes = []
 
         for issue in issues:
-            if issue["type"] == "build_config_issue":
-                fixes.append({
-                    "issue": issue,
-                    "fix": "Fix build configuration",
-                    "description": issue["description"],
-                    "priority": issue["priority"],
-                    "source": "existing_config"
-                })
-            elif issue["type"] == "build_failure":
-                fixes.append({
-                    "issue": issue,
-                    "fix": "Fix build failures",
-                    "description": "Review and fix the build failures identified in logs",
-                    "priority": issue["priority"],
-                    "source": "existing_logs"
-                })
+            template = _FIX_TEMPLATES.get(issue["type"])
+            if template is None:
+                continue
+            fix, description, source = template
+            fixes.append({
+                "issue": issue,
+                "fix": fix,
+                "description": description or issue["description"],
+                "priority": issue["priority"],
+                "source": source
+            })
 
         return fixes
@@ -6,23 +6,171 @@ CRITICAL: This agent analyzes existing tool outputs and logs.
 It does NOT run expensive tools like flake8, black, or mypy.
 """
 
-import json
+import asyncio
+import os
+import re
+from collections.abc import Mapping
+from itertools import chain
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
-from .base_expert import BaseExpert, HallucinationResult
+from ._fs import list_names, walk_files
+from ._io import READ_BUFFER_SIZE, iter_json_array, mapped_search
+from .base_expert import (
+    PRIORITY_LOW,
+    PRIORITY_MEDIUM,
+    BaseExpert,
+    Finding,
+    HallucinationResult,
+    LintFinding,
+    cached_scan,
+)
+from .rule_engine import Rule, RuleEngine
+
+# Tool configuration and output probed at the project root
+_TOOL_OUTPUTS = (
+    "pyproject.toml",  # Contains black, mypy, pytest, ruff config
+    ".ruff.toml",      # Ruff configuration
+    "pytest.ini",      # Pytest configuration
+    "setup.cfg",       # Alternative config location
+    ".flake8",         # Flake8 configuration
+    "tox.ini",         # Tox configuration
+    "coverage.xml",    # Coverage reports
+    "htmlcov/",        # Coverage HTML output
+    "logs/",           # Log files directory
+    ".github/workflows/",  # GitHub Actions workflows
+    ".gitlab-ci.yml",      # GitLab CI configuration
+)
+
+# Tool outputs above that live below a root directory and need a stat
+_NESTED_TOOL_OUTPUTS = tuple(
+    name.rstrip("/") for name in _TOOL_OUTPUTS if "/" in name.rstrip("/")
+)
+
+# CI/CD directories and the artifact suffixes collected from them
+_CI_DIRS = (".github", ".gitlab-ci", ".circleci", "ci", "jenkins")
+_CI_SUFFIXES = (".yml", ".yaml", ".json")
+
+# flake8 reports and configuration, relative to the project root
+_FLAKE8_FILES = ("flake8_report.json", "flake8_report.txt", ".flake8")
+
+# One flake8 text line: file, line, column and the message, which starts
+# with the error code
+_FLAKE8_LINE = re.compile(rb"^\s*([^:]*):(\d+):(\d+):\s*((\S+).*?)\s*$")
+
+
+# Formatter and type checker configuration checks: the tool name (any case)
+# and an option that shows it is actually configured must both be present.
+# pyproject.toml feeds both rules and is classified in one pass.
+_RULES = RuleEngine([
+    Rule(
+        issue_type="formatting_config",
+        files=("black_report.txt", "pyproject.toml"),
+        pattern=rb"(?P<tool>(?i:black))|(?P<option>line-length|target-version)",
+        required=frozenset({"tool", "option"}),
+        description="Black formatter configuration found",
+        priority=PRIORITY_LOW,
+        tool="black",
+        source="existing_config",
+        fix="Configure Black formatter",
+        fix_description="Set up Black formatting rules in pyproject.toml",
+        fix_priority=PRIORITY_LOW,
+    ),
+    Rule(
+        issue_type="type_checking_config",
+        files=("mypy_report.txt", "pyproject.toml", "setup.cfg"),
+        pattern=rb"(?P<tool>(?i:mypy))|(?P<option>warn_return_any|disallow_untyped_defs)",
+        required=frozenset({"tool", "option"}),
+        description="MyPy type checker configuration found",
+        priority=PRIORITY_LOW,
+        tool="mypy",
+        source="existing_config",
+        fix="Configure MyPy type checker",
+        fix_description="Set up MyPy type checking rules",
+        fix_priority=PRIORITY_LOW,
+    ),
+])
+
+# Quality tools whose presence in a CI config counts as integration
+_CI_TOOLS_RE = re.compile(rb"flake8|black|mypy")
+
+
+def _flake8_json_issues(path: Path) -> list[LintFinding]:
+    """Convert a flake8 JSON report, streamed item by item when it is large"""
+    return [
+        LintFinding(
+            type="code_quality_issue",
+            file=issue.get("filename", "unknown"),
+            line=issue.get("line_number", 0),
+            column=issue.get("column_number", 0),
+            code=issue.get("code", ""),
+            description=issue.get("text", ""),
+            priority=PRIORITY_MEDIUM,
+            tool="flake8",
+            source="existing_output",
+        )
+        for issue in iter_json_array(path)
+    ]
+
+
+def _flake8_text_issues(path: Path) -> list[LintFinding]:
+    """Convert flake8's default file:line:col: CODE text output
+
+    Lines are matched as bytes and only the captured fields are decoded.
+    """
+    issues = []
+    with open(path, "rb", buffering=READ_BUFFER_SIZE) as f:
+        for line in f:
+            match = _FLAKE8_LINE.match(line)
+            if match is None:
+                continue
+            file, line_no, column, description, code = match.groups()
+            issues.append(LintFinding(
+                type="code_quality_issue",
+                file=file.decode(errors="replace"),
+                line=int(line_no),
+                column=int(column),
+                code=code.decode(errors="replace"),
+                description=description.decode(errors="replace"),
+                priority=PRIORITY_MEDIUM,
+                tool="flake8",
+                source="existing_output",
+            ))
+    return issues
+
+
+def _walk_ci_dirs(root: str, top: frozenset[str]) -> list[str]:
+    """Collect the CI/CD artifacts under every CI directory present in top"""
+    ci_artifacts = []
+    for ci_dir in _CI_DIRS:
+        if ci_dir in top:
+            # Nothing is pruned: CI artifacts often live in build/ or dist/
+            ci_dir_path = os.path.join(root, ci_dir)
+            ci_artifacts.extend(walk_files(ci_dir_path, _CI_SUFFIXES, prune=None))
+    return ci_artifacts
 
 
 class CodeQualityExpert(BaseExpert):
     """Code quality expert that analyzes existing tool outputs and logs"""
 
+    _scan_inputs = _FLAKE8_FILES + _RULES.files + _NESTED_TOOL_OUTPUTS
+
+    def _scan_walk_inputs(self, root: str) -> list[str]:
+        """Return the CI/CD artifacts, which the scan reads and may walk for"""
+        return _walk_ci_dirs(root, list_names(root))
+
+    @cached_scan
     async def detect_hallucinations(self, project_path: Path) -> HallucinationResult:
         """Analyze existing code quality data and provide recommendations"""
-        hallucinations = []
         recommendations = []
 
-        # Look for existing tool output files
-        tool_outputs = await self._find_existing_tool_outputs(project_path)
+        # Look for existing tool output files; the root listing and the walk
+        # of the CI directories are each taken once and shared with every
+        # analyzer, and the walk made for the cache key is reused
+        top = list_names(project_path)
+        walked = self._walked_inputs(project_path)
+        ci_artifacts = await self._find_ci_artifacts(project_path, top, walked)
+        tool_outputs = await self._find_top_level(project_path, top) + ci_artifacts
         
         if not tool_outputs:
             recommendations = [
@@ -37,21 +185,15 @@ class CodeQualityExpert(BaseExpert):
                 recommendations=recommendations
             )
 
-        # Analyze existing flake8 outputs
-        flake8_issues = await self._analyze_existing_flake8_outputs(project_path)
-        hallucinations.extend(flake8_issues)
-
-        # Analyze existing black outputs
-        black_issues = await self._analyze_existing_black_outputs(project_path)
-        hallucinations.extend(black_issues)
-
-        # Analyze existing mypy outputs
-        mypy_issues = await self._analyze_existing_mypy_outputs(project_path)
-        hallucinations.extend(mypy_issues)
-
-        # Analyze existing CI/CD logs
-        ci_issues = await self._analyze_existing_ci_logs(project_path)
-        hallucinations.extend(ci_issues)
+        # Analyze existing flake8, black and mypy outputs and CI/CD logs; the
+        # analyzers read on worker threads, so running them together overlaps
+        # their file I/O
+        results = await asyncio.gather(
+            self._analyze_existing_flake8_outputs(project_path, top),
+            _RULES.run(self, project_path, top),
+            self._analyze_existing_ci_logs(project_path, ci_artifacts, top),
+        )
+        hallucinations = list(chain.from_iterable(results))
 
         # Generate recommendations based on existing data
         if hallucinations:
@@ -78,185 +220,100 @@ class CodeQualityExpert(BaseExpert):
             recommendations=recommendations,
         )
 
-    async def _find_existing_tool_outputs(self, project_path: Path) -> list[Path]:
-        """Find existing tool output files without running tools"""
+    async def _find_top_level(
+        self, project_path: Path, top: Optional[frozenset[str]] = None
+    ) -> list[Path]:
+        """Find tool configuration and output files at the project root"""
         output_files = []
+        root = os.fspath(project_path)
+        if top is None:
+            top = list_names(root)
         
-        # Use actual tool configuration from project
-        tool_outputs = [
-            "pyproject.toml",  # Contains black, mypy, pytest, ruff config
-            ".ruff.toml",      # Ruff configuration
-            "pytest.ini",      # Pytest configuration
-            "setup.cfg",       # Alternative config location
-            ".flake8",         # Flake8 configuration
-            "tox.ini",         # Tox configuration
-            "coverage.xml",    # Coverage reports
-            "htmlcov/",        # Coverage HTML output
-            "logs/",           # Log files directory
-            ".github/workflows/",  # GitHub Actions workflows
-            ".gitlab-ci.yml",      # GitLab CI configuration
-        ]
-        
-        for output_file in tool_outputs:
-            file_path = project_path / output_file
-            if file_path.exists():
-                output_files.append(file_path)
+        # One listing of the project root answers every top-level probe;
+        # only nested candidates need a stat of their own
+        for output_file in _TOOL_OUTPUTS:
+            name = output_file.rstrip("/")
+            head, sep, _ = name.partition("/")
+            if head in top and (not sep or os.path.exists(os.path.join(root, name))):
+                output_files.append(os.path.join(root, name))
         
-        # Look for CI/CD artifacts
-        ci_dirs = [".github", ".gitlab-ci", ".circleci", "ci", "jenkins"]
-        for ci_dir in ci_dirs:
-            ci_path = project_path / ci_dir
-            if ci_path.exists():
-                output_files.extend(ci_path.rglob("*.yml"))
-                output_files.extend(ci_path.rglob("*.yaml"))
-                output_files.extend(ci_path.rglob("*.json"))
-        
-        return output_files
+        return [Path(path) for path in output_files]
 
-    async def _analyze_existing_flake8_outputs(self, project_path: Path) -> list[dict[str, Any]]:
+    async def _find_ci_artifacts(
+        self,
+        project_path: Path,
+        top: Optional[frozenset[str]] = None,
+        walked: Optional[list[str]] = None,
+    ) -> list[Path]:
+        """Find CI/CD artifacts under the CI directories in a single walk"""
+        root = os.fspath(project_path)
+        if walked is not None:
+            paths = walked
+        else:
+            if top is None:
+                top = list_names(root)
+            paths = await asyncio.to_thread(_walk_ci_dirs, root, top)
+        return [Path(path) for path in paths]
+
+    async def _analyze_existing_flake8_outputs(
+        self, project_path: Path, top: Optional[frozenset[str]] = None
+    ) -> list[Finding]:
         """Analyze existing flake8 output files"""
-        issues = []
+        issues: list[Finding] = []
+        root = os.fspath(project_path)
+        if top is None:
+            top = list_names(root)
         
         # Look for flake8 output files
-        flake8_files = [
-            project_path / "flake8_report.json",
-            project_path / "flake8_report.txt",
-            project_path / ".flake8"
-        ]
-        
-        for flake8_file in flake8_files:
-            if flake8_file.exists():
+        for name in _FLAKE8_FILES:
+            if name in top:
+                flake8_file = os.path.join(root, name)
                 try:
-                    if flake8_file.suffix == ".json":
-                        with open(flake8_file, 'r') as f:
-                            data = json.load(f)
-                            for issue in data:
-                                issues.append({
-                                    "type": "code_quality_issue",
-                                    "file": issue.get("filename", "unknown"),
-                                    "line": issue.get("line_number", 0),
-                                    "column": issue.get("column_number", 0),
-                                    "code": issue.get("code", ""),
-                                    "description": issue.get("text", ""),
-                                    "priority": "medium",
-                                    "tool": "flake8",
-                                    "source": "existing_output"
-                                })
+                    if name.endswith(".json"):
+                        issues.extend(
+                            await self._read_cached(flake8_file, _flake8_json_issues)
+                        )
                     else:
                         # Parse text output
-                        with open(flake8_file, 'r') as f:
-                            for line in f:
-                                if ':' in line:
-                                    parts = line.strip().split(':')
-                                    if len(parts) >= 4:
-                                        issues.append({
-                                            "type": "code_quality_issue",
-                                            "file": parts[0],
-                                            "line": int(parts[1]) if parts[1].isdigit() else 0,
-                                            "column": int(parts[2]) if parts[2].isdigit() else 0,
-                                            "code": parts[3].split()[0] if len(parts[3].split()) > 0 else "",
-                                            "description": ':'.join(parts[3:]).strip(),
-                                            "priority": "medium",
-                                            "tool": "flake8",
-                                            "source": "existing_output"
-                                        })
+                        issues.extend(
+                            await self._read_cached(flake8_file, _flake8_text_issues)
+                        )
                 except Exception as e:
                     self.logger.warning(f"Could not parse {flake8_file}: {e}")
         
         return issues
 
-    async def _analyze_existing_black_outputs(self, project_path: Path) -> list[dict[str, Any]]:
-        """Analyze existing black output files"""
-        issues = []
-        
-        # Look for black output files
-        black_files = [
-            project_path / "black_report.txt",
-            project_path / "pyproject.toml"
-        ]
-        
-        for black_file in black_files:
-            if black_file.exists():
-                try:
-                    with open(black_file, 'r') as f:
-                        content = f.read()
-                        if "black" in content.lower():
-                            # Check if black is configured
-                            if "line-length" in content or "target-version" in content:
-                                issues.append({
-                                    "type": "formatting_config",
-                                    "file": str(black_file),
-                                    "description": "Black formatter configuration found",
-                                    "priority": "low",
-                                    "tool": "black",
-                                    "source": "existing_config"
-                                })
-                except Exception as e:
-                    self.logger.warning(f"Could not parse {black_file}: {e}")
-        
-        return issues
-
-    async def _analyze_existing_mypy_outputs(self, project_path: Path) -> list[dict[str, Any]]:
-        """Analyze existing mypy output files"""
-        issues = []
-        
-        # Look for mypy output files
-        mypy_files = [
-            project_path / "mypy_report.txt",
-            project_path / "pyproject.toml",
-            project_path / "setup.cfg"
-        ]
-        
-        for mypy_file in mypy_files:
-            if mypy_file.exists():
-                try:
-                    with open(mypy_file, 'r') as f:
-                        content = f.read()
-                        if "mypy" in content.lower():
-                            # Check if mypy is configured
-                            if "warn_return_any" in content or "disallow_untyped_defs" in content:
-                                issues.append({
-                                    "type": "type_checking_config",
-                                    "file": str(mypy_file),
-                                    "description": "MyPy type checker configuration found",
-                                    "priority": "low",
-                                    "tool": "mypy",
-                                    "source": "existing_config"
-                                })
-                except Exception as e:
-                    self.logger.warning(f"Could not parse {mypy_file}: {e}")
-        
-        return issues
-
-    async def _analyze_existing_ci_logs(self, project_path: Path) -> list[dict[str, Any]]:
+    async def _analyze_existing_ci_logs(
+        self,
+        project_path: Path,
+        ci_artifacts: Optional[list[Path]] = None,
+        top: Optional[frozenset[str]] = None,
+    ) -> list[Finding]:
         """Analyze existing CI/CD logs for quality information"""
         issues = []
         
-        # Look for CI/CD configuration files
-        ci_dirs = [".github", ".gitlab-ci", ".circleci", "ci", "jenkins"]
-        
-        for ci_dir in ci_dirs:
-            ci_path = project_path / ci_dir
-            if ci_path.exists():
-                for config_file in ci_path.rglob("*.yml"):
-                    try:
-                        with open(config_file, 'r') as f:
-                            content = f.read()
-                            if "flake8" in content or "black" in content or "mypy" in content:
-                                issues.append({
-                                    "type": "ci_quality_integration",
-                                    "file": str(config_file),
-                                    "description": "Quality tools integrated in CI/CD pipeline",
-                                    "priority": "low",
-                                    "tool": "ci_cd",
-                                    "source": "existing_config"
-                                })
-                    except Exception as e:
-                        self.logger.warning(f"Could not parse {config_file}: {e}")
+        # Look for CI/CD configuration files, reusing an earlier walk if given
+        if ci_artifacts is None:
+            ci_artifacts = await self._find_ci_artifacts(project_path, top)
+        for config_file in ci_artifacts:
+            if not config_file.name.endswith(".yml"):
+                continue
+            try:
+                if await self._read_cached(config_file, mapped_search, _CI_TOOLS_RE):
+                    issues.append(Finding(
+                        type="ci_quality_integration",
+                        file=str(config_file),
+                        description="Quality tools integrated in CI/CD pipeline",
+                        priority=PRIORITY_LOW,
+                        tool="ci_cd",
+                        source="existing_config",
+                    ))
+            except Exception as e:
+                self.logger.warning(f"Could not parse {config_file}: {e}")
         
         return issues
 
-    async def suggest_fixes(self, issues: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    async def suggest_fixes(self, issues: list[Mapping[str, Any]]) -> list[dict[str, Any]]:
         """Suggest fixes based on existing tool outputs"""
         fixes = []
 
@@ -269,22 +326,10 @@ class CodeQualityExpert(BaseExpert):
                     "priority": "medium",
                     "source": "existing_tool_output"
                 })
-            elif issue["type"] == "formatting_config":
-                fixes.append({
-                    "issue": issue,
-                    "fix": "Configure Black formatter",
-                    "description": "Set up Black formatting rules in pyproject.toml",
-                    "priority": "low",
-                    "source": "existing_config"
-                })
-            elif issue["type"] == "type_checking_config":
-                fixes.append({
-                    "issue": issue,
-                    "fix": "Configure MyPy type checker",
-                    "description": "Set up MyPy type checking rules",
-                    "priority": "low",
-                    "source": "existing_config"
-                })
+            else:
+                fix = _RULES.fix_for(issue)
+                if fix is not None:
+                    fixes.append(fix)
 
         return fixes
 
@@ -322,10 +367,21 @@ class CodeQualityExpert(BaseExpert):
             # Ensure score doesn't go below 0
             quality_score = max(0.0, quality_score)
         
-        # Extract specific issue types for quality enforcement
-        flake8_issues = [h for h in result.hallucinations if h.get("tool") == "flake8"]
-        code_style_issues = [h for h in result.hallucinations if h.get("type") == "formatting_config"]
-        complexity_issues = [h for h in result.hallucinations if h.get("type") == "type_checking_config"]
+        # Extract specific issue types for quality enforcement, as plain
+        # dicts so the metrics can be serialized
+        flake8_issues = [
+            dict(h) for h in result.hallucinations if h.get("tool") == "flake8"
+        ]
+        code_style_issues = [
+            dict(h)
+            for h in result.hallucinations
+            if h.get("type") == "formatting_config"
+        ]
+        complexity_issues = [
+            dict(h)
+            for h in result.hallucinations
+            if h.get("type") == "type_checking_config"
+        ]
         
         return {
             "quality_score": quality_score,
@@ -6,12 +6,17 @@ CRITICAL: This agent analyzes existing CI/CD logs and configuration files.
 It does NOT run expensive deployment or infrastructure tools.
 """
 
+import re
+
 import yaml
 from pathlib import Path
 from typing import Any
 
 from .base_expert import BaseExpert, HallucinationResult
 
+# Error markers looked for in deployment and CI logs
+_LOG_ERROR_RE = re.compile(r"error|failed", re.IGNORECASE)
+
 
 class DevOpsExpert(BaseExpert):
     """DevOps expert that analyzes existing CI/CD logs and configuration"""
@@ -407,7 +412,7 @@ class DevOpsExpert(BaseExpert):
                     with open(log_path, 'r') as f:
                         content = f.read()
                         # Check for common error patterns
-                        if "error" in content.lower() or "failed" in content.lower():
+                        if _LOG_ERROR_RE.search(content):
                             issues.append({
                                 "type": "log_analysis",
                                 "file": str(log_path),
@@ -6,22 +6,74 @@ CRITICAL: This agent analyzes existing MCP configuration and logs.
 It does NOT run expensive MCP tools.
 """
 
+import os
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Any
-
-from .base_expert import BaseExpert, HallucinationResult
+from typing import Any, Optional
+
+from ._fs import list_names
+from .base_expert import (
+    PRIORITY_HIGH,
+    PRIORITY_MEDIUM,
+    BaseExpert,
+    HallucinationResult,
+    cached_scan,
+)
+from .rule_engine import LOG_ERRORS, Rule, RuleEngine
+
+# MCP configuration files probed at the project root
+_CONFIG_FILES = (
+    "mcp_config.json", "mcp.yaml", "mcp.toml",
+    ".mcp", "mcp_server.json", "mcp_client.json",
+)
+
+# MCP log directories probed at the project root
+_LOG_DIRS = ("logs", "mcp_logs", ".mcp_logs")
+
+# Configuration checks and log scans; each file is classified in one pass
+_RULES = RuleEngine([
+    Rule(
+        issue_type="mcp_config_issue",
+        files=("mcp_config.json", "mcp.yaml"),
+        # MCP mentions (any case) and the server/client keys it needs
+        pattern=rb"(?P<tool>(?i:mcp))|(?P<role>server|client)",
+        required=frozenset({"tool"}),
+        forbidden=frozenset({"role"}),
+        description="MCP configuration missing server/client specification",
+        priority=PRIORITY_MEDIUM,
+        tool="mcp_config",
+        source="existing_config",
+        fix="Fix MCP configuration",
+    ),
+    Rule(
+        issue_type="mcp_failure",
+        files=("mcp.log", "mcp_server.log", "mcp_client.log"),
+        pattern=LOG_ERRORS,
+        required=frozenset({"error"}),
+        description="MCP log contains error or failure messages",
+        priority=PRIORITY_HIGH,
+        tool="mcp_logs",
+        source="existing_logs",
+        fix="Fix MCP failures",
+        fix_description="Review and fix the MCP failures identified in logs",
+    ),
+])
 
 
 class MCPExpert(BaseExpert):
     """MCP expert that analyzes existing MCP configuration and logs"""
 
+    _scan_inputs = _RULES.files
+
+    @cached_scan
     async def detect_hallucinations(self, project_path: Path) -> HallucinationResult:
         """Analyze existing MCP data and provide recommendations"""
-        hallucinations = []
         recommendations = []
 
-        # Look for existing MCP configuration and logs
-        mcp_data = await self._find_existing_mcp_data(project_path)
+        # Look for existing MCP configuration and logs; the root listing is
+        # taken once and shared with the analyzers
+        top = list_names(project_path)
+        mcp_data = await self._find_existing_mcp_data(project_path, top)
         
         if not mcp_data:
             recommendations = [
@@ -36,13 +88,8 @@ class MCPExpert(BaseExpert):
                 recommendations=recommendations
             )
 
-        # Analyze MCP configuration
-        config_issues = await self._analyze_mcp_config(project_path)
-        hallucinations.extend(config_issues)
-
-        # Analyze MCP logs
-        log_issues = await self._analyze_mcp_logs(project_path)
-        hallucinations.extend(log_issues)
+        # Analyze MCP configuration and logs
+        hallucinations = await _RULES.run(self, project_path, top)
 
         # Generate recommendations based on existing data
         if hallucinations:
@@ -167,107 +214,27 @@ class MCPExpert(BaseExpert):
         """Get the weight of the MCP quality metric."""
         return 1.1
 
-    async def _find_existing_mcp_data(self, project_path: Path) -> list[Path]:
+    async def _find_existing_mcp_data(
+        self, project_path: Path, top: Optional[frozenset[str]] = None
+    ) -> list[Path]:
         """Find existing MCP configuration and log files"""
         mcp_files = []
+        root = os.fspath(project_path)
+        if top is None:
+            top = list_names(root)
         
         # MCP configuration files
-        config_files = [
-            "mcp_config.json", "mcp.yaml", "mcp.toml",
-            ".mcp", "mcp_server.json", "mcp_client.json"
-        ]
-        
-        for config_file in config_files:
-            file_path = project_path / config_file
-            if file_path.exists():
-                mcp_files.append(file_path)
+        for config_file in _CONFIG_FILES:
+            if config_file in top:
+                mcp_files.append(os.path.join(root, config_file))
         
         # MCP log directories
-        log_dirs = ["logs/", "mcp_logs/", ".mcp_logs/"]
-        for log_dir in log_dirs:
-            dir_path = project_path / log_dir
-            if dir_path.exists():
-                mcp_files.append(dir_path)
-        
-        return mcp_files
-
-    async def _analyze_mcp_config(self, project_path: Path) -> list[dict[str, Any]]:
-        """Analyze existing MCP configuration files"""
-        issues = []
+        for name in _LOG_DIRS:
+            if name in top:
+                mcp_files.append(os.path.join(root, name))
         
-        # Check for MCP configuration files
-        config_files = [
-            project_path / "mcp_config.json",
-            project_path / "mcp.yaml"
-        ]
-        
-        for config_file in config_files:
-            if config_file.exists():
-                try:
-                    with open(config_file, 'r') as f:
-                        content = f.read()
-                        if "mcp" in content.lower():
-                            # Check for basic configuration
-                            if "server" not in content and "client" not in content:
-                                issues.append({
-                                    "type": "mcp_config_issue",
-                                    "file": str(config_file),
-                                    "description": "MCP configuration missing server/client specification",
-                                    "priority": "medium",
-                                    "tool": "mcp_config",
-                                    "source": "existing_config"
-                                })
-                except Exception as e:
-                    self.logger.warning(f"Could not read {config_file}: {e}")
-        
-        return issues
+        return [Path(path) for path in mcp_files]
 
-    async def _analyze_mcp_logs(self, project_path: Path) -> list[dict[str, Any]]:
-        """Analyze existing MCP logs"""
-        issues = []
-        
-        # Look for MCP log files
-        log_files = ["mcp.log", "mcp_server.log", "mcp_client.log"]
-        for log_file in log_files:
-            log_path = project_path / log_file
-            if log_path.exists():
-                try:
-                    with open(log_path, 'r') as f:
-                        content = f.read()
-                        if "error" in content.lower() or "failed" in content.lower():
-                            issues.append({
-                                "type": "mcp_failure",
-                                "file": str(log_path),
-                                "description": "MCP log contains error or failure messages",
-                                "priority": "high",
-                                "tool": "mcp_logs",
-                                "source": "existing_logs"
-                            })
-                except Exception as e:
-                    self.logger.warning(f"Could not read {log_path}: {e}")
-        
-        return issues
-
-    async def suggest_fixes(self, issues: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    async def suggest_fixes(self, issues: list[Mapping[str, Any]]) -> list[dict[str, Any]]:
         """Suggest fixes based on existing MCP data"""
-        fixes = []
-
-        for issue in issues:
-            if issue["type"] == "mcp_config_issue":
-                fixes.append({
-                    "issue": issue,
-                    "fix": "Fix MCP configuration",
-                    "description": issue["description"],
-                    "priority": issue["priority"],
-                    "source": "existing_config"
-                })
-            elif issue["type"] == "mcp_failure":
-                fixes.append({
-                    "issue": issue,
-                    "fix": "Fix MCP failures",
-                    "description": "Review and fix the MCP failures identified in logs",
-                    "priority": issue["priority"],
-                    "source": "existing_logs"
-                })
-
-        return fixes
+        return _RULES.suggest_fixes(issues)
@@ -6,22 +6,74 @@ CRITICAL: This agent analyzes existing model configuration and outputs.
 It does NOT run expensive model training or inference tools.
 """
 
+import os
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Any
-
-from .base_expert import BaseExpert, HallucinationResult
+from typing import Any, Optional
+
+from ._fs import list_names
+from .base_expert import (
+    PRIORITY_HIGH,
+    PRIORITY_MEDIUM,
+    BaseExpert,
+    HallucinationResult,
+    cached_scan,
+)
+from .rule_engine import LOG_ERRORS, Rule, RuleEngine
+
+# Model configuration files probed at the project root
+_CONFIG_FILES = (
+    "model_config.json", "model.yaml", "config.yaml",
+    "hyperparameters.json", "model_params.json",
+)
+
+# Model output directories probed at the project root
+_OUTPUT_DIRS = ("models", "checkpoints", "outputs", "results")
+
+# Configuration checks and output scans; each file is classified in one pass
+_RULES = RuleEngine([
+    Rule(
+        issue_type="model_config_issue",
+        files=("model_config.json", "config.yaml"),
+        # Model mentions (any case) and the version key it needs
+        pattern=rb"(?P<tool>(?i:model))|(?P<version>version)",
+        required=frozenset({"tool"}),
+        forbidden=frozenset({"version"}),
+        description="Model configuration missing version information",
+        priority=PRIORITY_MEDIUM,
+        tool="model_config",
+        source="existing_config",
+        fix="Fix model configuration",
+    ),
+    Rule(
+        issue_type="model_failure",
+        files=("model.log", "training.log", "evaluation.log"),
+        pattern=LOG_ERRORS,
+        required=frozenset({"error"}),
+        description="Model log contains error or failure messages",
+        priority=PRIORITY_HIGH,
+        tool="model_logs",
+        source="existing_logs",
+        fix="Fix model failures",
+        fix_description="Review and fix the model failures identified in logs",
+    ),
+])
 
 
 class ModelExpert(BaseExpert):
     """Model expert that analyzes existing model configuration and outputs"""
 
+    _scan_inputs = _RULES.files
+
+    @cached_scan
     async def detect_hallucinations(self, project_path: Path) -> HallucinationResult:
         """Analyze existing model data and provide recommendations"""
-        hallucinations = []
         recommendations = []
 
-        # Look for existing model configuration and outputs
-        model_data = await self._find_existing_model_data(project_path)
+        # Look for existing model configuration and outputs; the root listing is
+        # taken once and shared with the analyzers
+        top = list_names(project_path)
+        model_data = await self._find_existing_model_data(project_path, top)
         
         if not model_data:
             recommendations = [
@@ -36,13 +88,8 @@ class ModelExpert(BaseExpert):
                 recommendations=recommendations
             )
 
-        # Analyze model configuration
-        config_issues = await self._analyze_model_config(project_path)
-        hallucinations.extend(config_issues)
-
-        # Analyze model outputs
-        output_issues = await self._analyze_model_outputs(project_path)
-        hallucinations.extend(output_issues)
+        # Analyze model configuration and outputs
+        hallucinations = await _RULES.run(self, project_path, top)
 
         # Generate recommendations based on existing data
         if hallucinations:
@@ -167,107 +214,27 @@ class ModelExpert(BaseExpert):
         """Get the weight of the model quality metric."""
         return 1.3
 
-    async def _find_existing_model_data(self, project_path: Path) -> list[Path]:
+    async def _find_existing_model_data(
+        self, project_path: Path, top: Optional[frozenset[str]] = None
+    ) -> list[Path]:
         """Find existing model configuration and output files"""
         model_files = []
+        root = os.fspath(project_path)
+        if top is None:
+            top = list_names(root)
         
         # Model configuration files
-        config_files = [
-            "model_config.json", "model.yaml", "config.yaml",
-            "hyperparameters.json", "model_params.json"
-        ]
-        
-        for config_file in config_files:
-            file_path = project_path / config_file
-            if file_path.exists():
-                model_files.append(file_path)
+        for config_file in _CONFIG_FILES:
+            if config_file in top:
+                model_files.append(os.path.join(root, config_file))
         
         # Model output directories
-        output_dirs = ["models/", "checkpoints/", "outputs/", "results/"]
-        for output_dir in output_dirs:
-            dir_path = project_path / output_dir
-            if dir_path.exists():
-                model_files.append(dir_path)
-        
-        return model_files
-
-    async def _analyze_model_config(self, project_path: Path) -> list[dict[str, Any]]:
-        """Analyze existing model configuration files"""
-        issues = []
+        for name in _OUTPUT_DIRS:
+            if name in top:
+                model_files.append(os.path.join(root, name))
         
-        # Check for model configuration files
-        config_files = [
-            project_path / "model_config.json",
-            project_path / "config.yaml"
-        ]
-        
-        for config_file in config_files:
-            if config_file.exists():
-                try:
-                    with open(config_file, 'r') as f:
-                        content = f.read()
-                        if "model" in content.lower():
-                            # Check for basic configuration
-                            if "version" not in content:
-                                issues.append({
-                                    "type": "model_config_issue",
-                                    "file": str(config_file),
-                                    "description": "Model configuration missing version information",
-                                    "priority": "medium",
-                                    "tool": "model_config",
-                                    "source": "existing_config"
-                                })
-                except Exception as e:
-                    self.logger.warning(f"Could not read {config_file}: {e}")
-        
-        return issues
+        return [Path(path) for path in model_files]
 
-    async def _analyze_model_outputs(self, project_path: Path) -> list[dict[str, Any]]:
-        """Analyze existing model outputs"""
-        issues = []
-        
-        # Look for model output files
-        output_files = ["model.log", "training.log", "evaluation.log"]
-        for output_file in output_files:
-            log_path = project_path / output_file
-            if log_path.exists():
-                try:
-                    with open(log_path, 'r') as f:
-                        content = f.read()
-                        if "error" in content.lower() or "failed" in content.lower():
-                            issues.append({
-                                "type": "model_failure",
-                                "file": str(log_path),
-                                "description": "Model log contains error or failure messages",
-                                "priority": "high",
-                                "tool": "model_logs",
-                                "source": "existing_logs"
-                            })
-                except Exception as e:
-                    self.logger.warning(f"Could not read {log_path}: {e}")
-        
-        return issues
-
-    async def suggest_fixes(self, issues: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    async def suggest_fixes(self, issues: list[Mapping[str, Any]]) -> list[dict[str, Any]]:
         """Suggest fixes based on existing model data"""
-        fixes = []
-
-        for issue in issues:
-            if issue["type"] == "model_config_issue":
-                fixes.append({
-                    "issue": issue,
-                    "fix": "Fix model configuration",
-                    "description": issue["description"],
-                    "priority": issue["priority"],
-                    "source": "existing_config"
-                })
-            elif issue["type"] == "model_failure":
-                fixes.append({
-                    "issue": issue,
-                    "fix": "Fix model failures",
-                    "description": "Review and fix the model failures identified in logs",
-                    "priority": issue["priority"],
-                    "source": "existing_logs"
-                })
-
-        return fixes
+        return _RULES.suggest_fixes(issues)
@@ -0,0 +1,149 @@
+"""
+Declarative keyword rules for clewcrew agents
+
+Several experts run the same check over and over: probe a few files at the
+project root, look for keywords in them, and report a finding when the right
+keywords are (or are not) there. A Rule describes one such check and a
+RuleEngine runs a table of them. Every rule that reads a given file is merged
+into one named-group regex, so each file is mapped and classified in a single
+pass however many rules look at it.
+"""
+
+import asyncio
+import os
+import re
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+from ._fs import list_names
+from ._io import file_match_groups
+from .base_expert import Finding
+
+if TYPE_CHECKING:
+    from .base_expert import BaseExpert
+
+# Error markers looked for in tool and build logs, as a rule pattern
+LOG_ERRORS = rb"(?P<error>(?i:error|failed))"
+
+# Named groups in a rule pattern, renamed per rule when patterns are merged
+_GROUP_NAME = re.compile(rb"\(\?P<(\w+)>")
+
+
+@dataclass(frozen=True)
+class Rule:
+    """One keyword check over a set of root-level files
+
+    pattern is an alternation of named groups and may only use inline flags.
+    A file triggers the rule when every group in required matched and none
+    in forbidden did. Rules that read the same file must not share keywords,
+    since each position in the file is credited to one group only.
+    """
+
+    issue_type: str
+    files: tuple[str, ...]
+    pattern: bytes
+    required: frozenset[str]
+    description: str
+    priority: str
+    tool: str
+    source: str
+    fix: str
+    forbidden: frozenset[str] = frozenset()
+    # Fix description and priority; the finding's own are used when None
+    fix_description: Optional[str] = None
+    fix_priority: Optional[str] = None
+
+
+class RuleEngine:
+    """Run a table of rules against a project and map findings to fixes"""
+
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        self.rules = tuple(rules)
+        self._by_type = {rule.issue_type: rule for rule in self.rules}
+
+        parts: dict[str, list[bytes]] = {}
+        for index, rule in enumerate(self.rules):
+            tagged = _GROUP_NAME.sub(rb"(?P<r%d_\1>" % index, rule.pattern)
+            for name in rule.files:
+                parts.setdefault(name, []).append(tagged)
+        self._patterns = {name: re.compile(b"|".join(p)) for name, p in parts.items()}
+
+        # Root-relative files the rules read, for BaseExpert._scan_inputs
+        self.files = tuple(self._patterns)
+
+    async def run(
+        self,
+        expert: "BaseExpert",
+        project_path: Path,
+        top: Optional[frozenset[str]] = None,
+    ) -> list[Finding]:
+        """Classify every present rule file once and return the findings
+
+        Files are read through the expert's per-file cache; findings come
+        out in rule order, then in the order of each rule's files.
+        """
+        root = os.fspath(project_path)
+        if top is None:
+            top = list_names(root)
+
+        paths = {name: os.path.join(root, name) for name in self.files if name in top}
+        results = await asyncio.gather(
+            *(
+                expert._read_cached(path, file_match_groups, self._patterns[name])
+                for name, path in paths.items()
+            ),
+            return_exceptions=True,
+        )
+
+        matched: dict[str, set[str]] = {}
+        for (name, path), result in zip(paths.items(), results):
+            if isinstance(result, FileNotFoundError):
+                continue
+            if isinstance(result, Exception):
+                expert.logger.warning(f"Could not read {path}: {result}")
+                continue
+            if isinstance(result, BaseException):
+                # Cancellation and interrupts are not read errors
+                raise result
+            matched[name] = result
+
+        findings = []
+        for index, rule in enumerate(self.rules):
+            prefix = f"r{index}_"
+            for name in rule.files:
+                groups = matched.get(name)
+                if groups is None:
+                    continue
+                found = {g[len(prefix):] for g in groups if g.startswith(prefix)}
+                if rule.required <= found and not rule.forbidden & found:
+                    findings.append(Finding(
+                        type=rule.issue_type,
+                        file=paths[name],
+                        description=rule.description,
+                        priority=rule.priority,
+                        tool=rule.tool,
+                        source=rule.source,
+                    ))
+
+        return findings
+
+    def fix_for(self, issue: Mapping[str, Any]) -> Optional[dict[str, Any]]:
+        """Return the fix for a finding raised by one of the rules, else None"""
+        rule = self._by_type.get(issue["type"])
+        if rule is None:
+            return None
+        return {
+            "issue": issue,
+            "fix": rule.fix,
+            "description": rule.fix_description or issue["description"],
+            "priority": rule.fix_priority or issue["priority"],
+            "source": rule.source,
+        }
+
+    def suggest_fixes(
+        self, issues: Sequence[Mapping[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Return the fixes for every finding raised by the rules"""
+        return [fix for fix in map(self.fix_for, issues) if fix is not None]
@@ -3,11 +3,244 @@
 Security Expert Agent for clewcrew
 """
 
+import asyncio
+import mmap
+import os
 import re
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from itertools import chain
 from pathlib import Path
-from typing import Any
+from typing import Any, Union
 
-from .base_expert import BaseExpert, HallucinationResult
+from ._fs import ROOT_ONLY_PRUNE_DIRS, walk_files
+from ._io import (
+    CHUNK_SIZE,
+    StrPath,
+    iter_prefetched,
+    map_file,
+)
+from .base_expert import (
+    PRIORITY_CRITICAL,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_MEDIUM,
+    BaseExpert,
+    HallucinationResult,
+    Record,
+)
+
+# Number of files scanned on worker threads at once
+SCAN_CONCURRENCY = min(32, (os.cpu_count() or 1) * 4)
+
+# Hardcoded credentials
+_CREDENTIAL_PATTERNS = (
+    r"sk-[a-zA-Z0-9]{48}",
+    r"pk_[a-zA-Z0-9]{48}",
+    r"AKIA[a-zA-Z0-9]{16}",
+    r"ghp_[a-zA-Z0-9]{36}",
+    r"gho_[a-zA-Z0-9]{36}",
+)
+
+# Subprocess security vulnerabilities; plain literals, not regexes
+_SUBPROCESS_PATTERNS = (
+    "import subprocess",
+    "subprocess.run",
+    "subprocess.Popen",
+    "subprocess.call",
+    "os.system",
+    "os.popen",
+)
+
+_PATTERNS = _CREDENTIAL_PATTERNS + _SUBPROCESS_PATTERNS
+
+# Finding type, priority and description template of each pattern category
+_CREDENTIAL = (
+    "security_vulnerability",
+    PRIORITY_HIGH,
+    "Potential hardcoded credential found: {}",
+)
+_SUBPROCESS = (
+    "subprocess_vulnerability",
+    PRIORITY_CRITICAL,
+    "Subprocess usage detected: {} - Security risk for command injection",
+)
+
+# Category of each entry in _PATTERNS
+_PATTERN_KINDS = (
+    (_CREDENTIAL,) * len(_CREDENTIAL_PATTERNS)
+    + (_SUBPROCESS,) * len(_SUBPROCESS_PATTERNS)
+)
+
+# A credential pattern made of a literal prefix and a fixed-length run of
+# ASCII letters and digits, e.g. ghp_[a-zA-Z0-9]{36}
+_PREFIXED_SHAPE = re.compile(r"([A-Za-z0-9_-]+)\[a-zA-Z0-9\]\{(\d+)\}")
+
+
+def _credential_shape(pattern: str) -> tuple[bytes, int]:
+    """Split a credential pattern into its literal prefix and run length"""
+    shape = _PREFIXED_SHAPE.fullmatch(pattern)
+    if shape is None:
+        raise ValueError(f"Credential pattern has no fixed prefix: {pattern}")
+    return shape[1].encode(), int(shape[2])
+
+
+# (index in _PATTERNS, prefix, run length) of every credential pattern;
+# they are matched with find() and a byte check, no regex
+_PREFIXED_CREDENTIALS = tuple(
+    (index, *_credential_shape(pattern))
+    for index, pattern in enumerate(_CREDENTIAL_PATTERNS)
+)
+
+# Subprocess literals grouped under a stem they all contain, with their
+# index in _PATTERNS; a group is only searched when its stem occurs
+_SUBPROCESS_GROUPS = tuple(
+    (stem, [
+        (index, literal.encode())
+        for index, literal in enumerate(
+            _SUBPROCESS_PATTERNS, len(_CREDENTIAL_PATTERNS)
+        )
+        if stem.decode() in literal
+    ])
+    for stem in (b"subprocess", b"os.")
+)
+
+# Shortest text any pattern can match; smaller files are not scanned
+_MIN_MATCH_LENGTH = len("os.popen")
+
+# Leading bytes checked for a NUL; a file holding one is binary, whatever
+# its name, and is not scanned
+_SNIFF_SIZE = 4096
+
+# Unreadable files named in the scan's single warning
+_MAX_REPORTED_ERRORS = 5
+
+# Risk added by one issue of each priority; anything else counts 1.0
+_RISK_SCORES = {PRIORITY_CRITICAL: 10.0, PRIORITY_HIGH: 5.0, PRIORITY_MEDIUM: 2.0}
+
+# Evidence beyond this many matches in one finding adds no further risk
+_MAX_RISK_WEIGHT = 5
+
+# Quality score lost per issue of each priority; anything else costs 5.0
+_QUALITY_PENALTIES = {PRIORITY_CRITICAL: 25.0, PRIORITY_HIGH: 15.0}
+
+# Fix, example template (filled from the issue) and priority per issue type
+_FIXES = {
+    "security_vulnerability": (
+        "Replace hardcoded credential with environment variable",
+        "# Replace: {pattern}\n# With: os.getenv('CREDENTIAL_KEY')",
+        PRIORITY_HIGH,
+    ),
+    "subprocess_vulnerability": (
+        "Replace subprocess call with native Python operation",
+        "# Replace subprocess.call with native Python libraries",
+        PRIORITY_CRITICAL,
+    ),
+}
+
+# Keywords in a proposed change that suggest credential exposure or command
+# injection, matched in any case
+_CREDENTIAL_CHANGE_RE = re.compile(r"password|secret|key|token", re.IGNORECASE)
+_INJECTION_CHANGE_RE = re.compile(r"subprocess|os\.system|eval|exec", re.IGNORECASE)
+
+
+@dataclass(frozen=True, eq=False)
+class SecurityFinding(Record):
+    """The matches of one pattern category in one file
+
+    pattern and line are those of the earliest match; lines holds the line
+    of every match of every pattern, in file order and once per match, so
+    a line with two matches appears twice and count equals len(lines).
+    """
+
+    __slots__ = (
+        "type",
+        "file",
+        "pattern",
+        "priority",
+        "description",
+        "line",
+        "lines",
+        "count",
+    )
+
+    type: str
+    file: str
+    pattern: str
+    priority: str
+    description: str
+    line: int
+    lines: tuple[int, ...]
+    count: int
+
+
+def _find_prefixed(
+    data: Union[mmap.mmap, bytes], prefix: bytes, length: int, start: int = 0
+) -> int:
+    """Return the offset of the first prefix followed by length alphanumerics
+
+    The search begins at start. The prefix is located with find() and the
+    run after it is checked with bytes.isalnum(), which only accepts ASCII
+    letters and digits. Returns -1 when there is no such occurrence.
+    """
+    skip = len(prefix)
+    offset = data.find(prefix, start)
+    while offset != -1:
+        run = data[offset + skip:offset + skip + length]
+        if len(run) == length and run.isalnum():
+            return offset
+        offset = data.find(prefix, offset + 1)
+    return -1
+
+
+def _find_literal(
+    data: Union[mmap.mmap, bytes], literal: bytes, offset: int
+) -> list[int]:
+    """Return the offsets of literal from its first occurrence, at offset
+
+    mmap has no count(), so the occurrences are stepped through with find().
+    """
+    offsets = []
+    while offset != -1:
+        offsets.append(offset)
+        offset = data.find(literal, offset + len(literal))
+    return offsets
+
+
+def _line_numbers(
+    data: Union[mmap.mmap, bytes], offsets: Iterable[int]
+) -> dict[int, int]:
+    """Map byte offsets in data to 1-based line numbers
+
+    Offsets are visited in order and only the newlines between consecutive
+    ones are counted, with bytes.count(), so data is traversed at most once
+    up to the last offset and no per-line table is built. A mapping is
+    counted CHUNK_SIZE bytes at a time, carrying the running line number
+    forward, so a hit deep in a large file never copies the whole prefix.
+    """
+    lines = {}
+    position, line = 0, 1
+    for offset in sorted(offsets):
+        while position < offset:
+            end = min(offset, position + CHUNK_SIZE)
+            line += data[position:end].count(b"\n")
+            position = end
+        lines[offset] = line
+    return lines
+
+
+def _risk_weights(issues: Iterable[Mapping[str, Any]]) -> "Counter[str]":
+    """Count issues per priority, each weighted by its match count
+
+    The weight is capped at _MAX_RISK_WEIGHT so one file full of matches
+    does not saturate the risk score on its own.
+    """
+    weights: Counter[str] = Counter()
+    for issue in issues:
+        weight = min(issue.get("count", 1), _MAX_RISK_WEIGHT)
+        weights[issue.get("priority", PRIORITY_LOW)] += weight
+    return weights
 
 
 class SecurityExpert(BaseExpert):
@@ -18,60 +251,40 @@ class SecurityExpert(BaseExpert):
         hallucinations = []
         recommendations = []
 
-        # Check for hardcoded credentials
-        credential_patterns = [
-            r"sk-[a-zA-Z0-9]{48}",
-            r"pk_[a-zA-Z0-9]{48}",
-            r"AKIA[a-zA-Z0-9]{16}",
-            r"ghp_[a-zA-Z0-9]{36}",
-            r"gho_[a-zA-Z0-9]{36}",
-        ]
-
-        # Check for subprocess security vulnerabilities
-        subprocess_patterns = [
-            r"import subprocess",
-            r"subprocess\.run",
-            r"subprocess\.Popen",
-            r"subprocess\.call",
-            r"os\.system",
-            r"os\.popen",
-        ]
-
-        # Check for security issues
-        for py_file in project_path.rglob("*.py"):
-            try:
-                content = py_file.read_text()
-
-                # Check for hardcoded credentials
-                for pattern in credential_patterns:
-                    if re.search(pattern, content):
-                        hallucinations.append(
-                            {
-                                "type": "security_vulnerability",
-                                "file": str(py_file),
-                                "pattern": pattern,
-                                "priority": "high",
-                                "description": f"Potential hardcoded credential found: {pattern}",
-                                "line": self._find_line_number(content, pattern),
-                            },
-                        )
-
-                # Check for subprocess vulnerabilities
-                for pattern in subprocess_patterns:
-                    if re.search(pattern, content):
-                        hallucinations.append(
-                            {
-                                "type": "subprocess_vulnerability",
-                                "file": str(py_file),
-                                "pattern": pattern,
-                                "priority": "critical",
-                                "description": f"Subprocess usage detected: {pattern} - Security risk for command injection",
-                                "line": self._find_line_number(content, pattern),
-                            },
-                        )
-
-            except Exception as e:
-                self.logger.warning(f"Could not read {py_file}: {e}")
+        # Check for security issues; files are read and scanned on worker
+        # threads, several at a time, and reported in walk order. Only the
+        # VCS and virtualenv directories at the project root are skipped,
+        # so a package named build or dist is still scanned.
+        py_files = await asyncio.to_thread(
+            walk_files,
+            project_path,
+            (".py",),
+            prune=ROOT_ONLY_PRUNE_DIRS.__contains__,
+            prune_root_only=True,
+        )
+        unreadable: list[tuple[StrPath, OSError]] = []
+        async for py_file, result in iter_prefetched(
+            py_files, self._scan_file, concurrency=SCAN_CONCURRENCY
+        ):
+            if isinstance(result, OSError):
+                unreadable.append((py_file, result))
+            elif isinstance(result, Exception):
+                # Only the read can fail for an unreadable file; anything
+                # else is a bug in the scan and is not passed off as I/O
+                raise result
+            else:
+                hallucinations.extend(result)
+
+        # One warning for the whole walk rather than one per unreadable file
+        if unreadable:
+            shown = "; ".join(
+                f"{path}: {e}" for path, e in unreadable[:_MAX_REPORTED_ERRORS]
+            )
+            more = len(unreadable) - _MAX_REPORTED_ERRORS
+            self.logger.warning(
+                f"Could not read {len(unreadable)} files: {shown}"
+                + (f" (and {more} more)" if more > 0 else "")
+            )
 
         # Generate recommendations
         if hallucinations:
@@ -97,56 +310,100 @@ class SecurityExpert(BaseExpert):
             recommendations=recommendations,
         )
 
-    def _find_line_number(self, content: str, pattern: str) -> int:
-        """Find the line number where a pattern occurs"""
-        lines = content.split("\n")
-        for i, line in enumerate(lines, 1):
-            if re.search(pattern, line):
-                return i
-        return 0
+    def _scan_file(self, py_file: StrPath) -> list[SecurityFinding]:
+        """Return the security findings for one Python file"""
+        with map_file(py_file) as data:
+            if len(data) < _MIN_MATCH_LENGTH:
+                return []
+            if data.find(b"\0", 0, _SNIFF_SIZE) != -1:
+                return []
+
+            # Offsets of every match, in file order, per index in _PATTERNS
+            matches: dict[int, list[int]] = {}
+
+            # Fixed-prefix credentials: find() the prefix, then check the
+            # bytes after it
+            for index, prefix, length in _PREFIXED_CREDENTIALS:
+                offset = _find_prefixed(data, prefix, length)
+                if offset == -1:
+                    continue
+                offsets = matches[index] = []
+                while offset != -1:
+                    offsets.append(offset)
+                    offset = _find_prefixed(
+                        data, prefix, length, offset + len(prefix) + length
+                    )
+
+            # Subprocess usage is a fixed set of literals, so find() locates
+            # every occurrence of each without a regex
+            for stem, literals in _SUBPROCESS_GROUPS:
+                if data.find(stem) == -1:
+                    continue
+                for index, literal in literals:
+                    offset = data.find(literal)
+                    if offset != -1:
+                        matches[index] = _find_literal(data, literal, offset)
 
-    async def suggest_fixes(self, issues: list[dict[str, Any]]) -> list[dict[str, Any]]:
+            if not matches:
+                return []
+
+            lines = _line_numbers(data, chain.from_iterable(matches.values()))
+
+        # One finding per category, carrying the line of every match in it
+        by_kind: dict[tuple[str, str, str], list[int]] = {}
+        for index in sorted(matches):
+            by_kind.setdefault(_PATTERN_KINDS[index], []).append(index)
+
+        file = os.fspath(py_file)
+        findings = []
+        for (issue_type, priority, description), indices in by_kind.items():
+            indices.sort(key=lambda index: matches[index][0])
+            patterns = [_PATTERNS[index] for index in indices]
+            offsets = sorted(chain.from_iterable(matches[index] for index in indices))
+            hit_lines = tuple(lines[offset] for offset in offsets)
+            findings.append(SecurityFinding(
+                type=issue_type,
+                file=file,
+                pattern=patterns[0],
+                priority=priority,
+                description=description.format(", ".join(patterns)),
+                line=hit_lines[0],
+                lines=hit_lines,
+                count=len(hit_lines),
+            ))
+        return findings
+
+    async def suggest_fixes(
+        self, issues: list[Mapping[str, Any]]
+    ) -> list[dict[str, Any]]:
         """Suggest fixes for security issues"""
         fixes = []
-
         for issue in issues:
-            if issue["type"] == "security_vulnerability":
-                fixes.append(
-                    {
-                        "issue": issue,
-                        "fix": "Replace hardcoded credential with environment variable",
-                        "example": f"# Replace: {issue['pattern']}\n# With: os.getenv('CREDENTIAL_KEY')",
-                        "priority": "high",
-                    }
-                )
-            elif issue["type"] == "subprocess_vulnerability":
-                fixes.append(
-                    {
-                        "issue": issue,
-                        "fix": "Replace subprocess call with native Python operation",
-                        "example": "# Replace subprocess.call with native Python libraries",
-                        "priority": "critical",
-                    }
-                )
+            entry = _FIXES.get(issue["type"])
+            if entry is None:
+                continue
+            fix, example, priority = entry
+            fixes.append(
+                {
+                    "issue": issue,
+                    "fix": fix,
+                    "example": example.format_map(issue),
+                    "priority": priority,
+                }
+            )
 
         return fixes
 
-    def calculate_risk_score(self, issues: list[dict[str, Any]]) -> float:
+    def calculate_risk_score(self, issues: list[Mapping[str, Any]]) -> float:
         """Calculate overall risk score for security issues"""
-        if not issues:
-            return 0.0
-
-        total_score = 0.0
-        for issue in issues:
-            if issue.get("priority") == "critical":
-                total_score += 10.0
-            elif issue.get("priority") == "high":
-                total_score += 5.0
-            elif issue.get("priority") == "medium":
-                total_score += 2.0
-            else:
-                total_score += 1.0
+        return self._risk_score(_risk_weights(issues))
 
+    @staticmethod
+    def _risk_score(priorities: "Counter[str]") -> float:
+        """Calculate the risk score from the weighted issues per priority"""
+        total_score = sum(
+            (_RISK_SCORES.get(p, 1.0) * count for p, count in priorities.items()), 0.0
+        )
         return min(10.0, total_score)
 
     # Quality Integration Methods
@@ -163,33 +420,26 @@ class SecurityExpert(BaseExpert):
         # Run security analysis
         result = await self.detect_hallucinations(project_path)
         
-        # Calculate security quality score
-        if not result.hallucinations:
-            quality_score = 100.0
-        else:
-            # Start with perfect score and penalize for issues
-            quality_score = 100.0
-            
-            for hallucination in result.hallucinations:
-                if hallucination.get("priority") == "critical":
-                    quality_score -= 25.0  # Critical issues are very expensive
-                elif hallucination.get("priority") == "high":
-                    quality_score -= 15.0  # High priority issues are costly
-                else:
-                    quality_score -= 5.0   # Other issues have moderate cost
-            
-            # Ensure score doesn't go below 0
-            quality_score = max(0.0, quality_score)
+        # Count the findings per priority once; every score below is
+        # derived from these counts instead of another pass over the list
+        priorities = Counter(h["priority"] for h in result.hallucinations)
+
+        # Start with perfect score and penalize for issues, not going below 0
+        penalty = sum(
+            (_QUALITY_PENALTIES.get(p, 5.0) * count for p, count in priorities.items()),
+            0.0,
+        )
+        quality_score = max(0.0, 100.0 - penalty)
         
         return {
             "quality_score": quality_score,
             "issues_found": len(result.hallucinations),
-            "critical_issues": len([h for h in result.hallucinations if h.get("priority") == "critical"]),
-            "high_issues": len([h for h in result.hallucinations if h.get("priority") == "high"]),
-            "security_issues": result.hallucinations,
+            "critical_issues": priorities[PRIORITY_CRITICAL],
+            "high_issues": priorities[PRIORITY_HIGH],
+            "security_issues": [dict(h) for h in result.hallucinations],
             "recommendations": result.recommendations,
             "confidence": result.confidence,
-            "risk_score": self.calculate_risk_score(result.hallucinations)
+            "risk_score": self._risk_score(_risk_weights(result.hallucinations))
         }
 
     async def provide_quality_recommendations(self, project_path: Path) -> list[str]:
@@ -223,11 +473,11 @@ class SecurityExpert(BaseExpert):
             change_content = change.get("content", "")
             
             # Check for potential security issues in changes
-            if any(pattern in change_content.lower() for pattern in ["password", "secret", "key", "token"]):
+            if _CREDENTIAL_CHANGE_RE.search(change_content):
                 security_risks.append("Potential credential exposure in changes")
                 risk_level = "high"
             
-            if any(pattern in change_content.lower() for pattern in ["subprocess", "os.system", "eval", "exec"]):
+            if _INJECTION_CHANGE_RE.search(change_content):
                 security_risks.append("Potential command injection risk in changes")
                 risk_level = "critical"
         
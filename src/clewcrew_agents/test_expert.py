@@ -6,12 +6,17 @@ CRITICAL: This agent analyzes existing test outputs and configuration.
 It does NOT run expensive testing tools.
 """
 
+import re
 from pathlib import Path
 from typing import Any
 import xml.etree.ElementTree as ET
 
 from .base_expert import BaseExpert, HallucinationResult
 
+# Case-insensitive keyword searches; no lowered copy of the file is built
+_PYTEST_RE = re.compile(r"pytest", re.IGNORECASE)
+_COVERAGE_RE = re.compile(r"coverage", re.IGNORECASE)
+
 
 class TestExpert(BaseExpert):
     """Test expert that analyzes existing test outputs and configuration"""
@@ -223,7 +228,7 @@ class TestExpert(BaseExpert):
                 try:
                     with open(pytest_file, 'r') as f:
                         content = f.read()
-                        if "pytest" in content.lower():
+                        if _PYTEST_RE.search(content):
                             # Check for common configuration issues
                             if "testpaths" not in content and "python_files" not in content:
                                 issues.append({
@@ -332,7 +337,7 @@ class TestExpert(BaseExpert):
                 try:
                     with open(index_file, 'r') as f:
                         content = f.read()
-                        if "coverage" in content.lower():
+                        if _COVERAGE_RE.search(content):
                             issues.append({
                                 "type": "coverage_report",
                                 "file": str(index_file),
@@ -0,0 +1,50 @@
+"""
+Tests for the ArchitectureExpert agent.
+"""
+
+import os
+
+import pytest
+
+from clewcrew_agents.architecture_expert import ArchitectureExpert
+
+
+class TestArchitectureExpert:
+    """Test the ArchitectureExpert class."""
+
+    def test_project_index_with_trailing_separator(self, tmp_path):
+        """Test top-level directories are found when the root ends in a separator."""
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "design.md").write_text("# Design\n")
+        (tmp_path / "src" / "pkg").mkdir(parents=True)
+        (tmp_path / "src" / "pkg" / "__init__.py").write_text("")
+
+        index = ArchitectureExpert()._collect_project_index(
+            os.fspath(tmp_path) + os.sep
+        )
+
+        assert index.has_design_docs
+        assert [os.path.basename(p) for p in index.md_files] == ["design.md"]
+        assert [os.path.basename(p) for p in index.py_files] == ["__init__.py"]
+
+    @pytest.mark.asyncio
+    async def test_quality_metrics_walk_project_once(self, tmp_path, monkeypatch):
+        """Test the metrics share one project walk with the detection."""
+        (tmp_path / "README.md").write_text("# Project\n")
+        expert = ArchitectureExpert()
+        walks = []
+        collect = expert._collect_project_index
+
+        def counting_collect(project_path):
+            walks.append(project_path)
+            return collect(project_path)
+
+        monkeypatch.setattr(expert, "_collect_project_index", counting_collect)
+        metrics = await expert.generate_quality_metrics(tmp_path)
+
+        assert metrics["arch_files_found"] == 1
+        assert walks == [tmp_path]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
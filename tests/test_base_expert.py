@@ -0,0 +1,215 @@
+"""
+Tests for the BaseExpert helpers.
+"""
+
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from clewcrew_agents.base_expert import (
+    SCAN_CACHE_SIZE,
+    BaseExpert,
+    Finding,
+    HallucinationResult,
+    LintFinding,
+    cached_scan,
+)
+
+
+class CountingExpert(BaseExpert):
+    """Minimal expert that counts how often it really scans."""
+
+    _scan_inputs = ("build.log",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.scans = 0
+
+    @cached_scan
+    async def detect_hallucinations(self, project_path: Path) -> HallucinationResult:
+        self.scans += 1
+        return HallucinationResult(hallucinations=[], confidence=0.9, recommendations=[])
+
+
+class TestScanCache:
+    """Test the detect_hallucinations scan cache."""
+
+    @pytest.fixture
+    def expert(self):
+        """Create a counting expert."""
+        return CountingExpert()
+
+    @pytest.mark.asyncio
+    async def test_repeat_scan_is_cached(self, expert, tmp_path):
+        """Test an unchanged project is only scanned once."""
+        first = await expert.detect_hallucinations(tmp_path)
+        second = await expert.detect_hallucinations(tmp_path)
+
+        assert first == second
+        assert expert.scans == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_result_is_a_copy(self, expert, tmp_path):
+        """Test changing a returned result does not change the cached one."""
+        first = await expert.detect_hallucinations(tmp_path)
+        first.recommendations.append("changed")
+        second = await expert.detect_hallucinations(tmp_path)
+
+        assert second.recommendations == []
+        assert expert.scans == 1
+
+    @pytest.mark.asyncio
+    async def test_new_root_entry_invalidates(self, expert, tmp_path):
+        """Test adding a file at the project root forces a rescan."""
+        (tmp_path / "pyproject.toml").write_text("[project]\n")
+        await expert.detect_hallucinations(tmp_path)
+
+        stat = tmp_path.stat()
+        (tmp_path / "Makefile").write_text("all:\n")
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        await expert.detect_hallucinations(tmp_path)
+
+        assert expert.scans == 2
+
+    @pytest.mark.asyncio
+    async def test_pyproject_change_invalidates(self, expert, tmp_path):
+        """Test touching pyproject.toml forces a rescan."""
+        pyproject = tmp_path / "pyproject.toml"
+        pyproject.write_text("[project]\n")
+        await expert.detect_hallucinations(tmp_path)
+
+        stat = pyproject.stat()
+        pyproject.write_text("[project]\nname = 'x'\n")
+        # Make sure the mtime moves even on coarse-grained filesystems
+        os.utime(pyproject, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        await expert.detect_hallucinations(tmp_path)
+
+        assert expert.scans == 2
+
+    @pytest.mark.asyncio
+    async def test_scan_input_change_invalidates(self, expert, tmp_path):
+        """Test rewriting a declared input file forces a rescan."""
+        log = tmp_path / "build.log"
+        log.write_text("ok\n")
+        await expert.detect_hallucinations(tmp_path)
+
+        log.write_text("error: build failed\n")
+        await expert.detect_hallucinations(tmp_path)
+
+        assert expert.scans == 2
+
+    @pytest.mark.asyncio
+    async def test_clear_scan_cache(self, expert, tmp_path):
+        """Test clear_scan_cache drops memoized results."""
+        await expert.detect_hallucinations(tmp_path)
+        expert.clear_scan_cache()
+        await expert.detect_hallucinations(tmp_path)
+
+        assert expert.scans == 2
+
+
+class TestReadCached:
+    """Test the per-file parse cache."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reads_share_one_parse(self, tmp_path):
+        """Test callers asking for the same unchanged file parse it once."""
+        expert = CountingExpert()
+        config = tmp_path / "setup.cfg"
+        config.write_text("[mypy]\n")
+        calls = []
+
+        def parse(path):
+            calls.append(path)
+            return path.read_text()
+
+        results = await asyncio.gather(
+            expert._read_cached(config, parse),
+            expert._read_cached(config, parse),
+        )
+        await expert._read_cached(config, parse)
+
+        assert results == ["[mypy]\n", "[mypy]\n"]
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_file_is_evicted(self, tmp_path):
+        """Test the cache keeps only the most recently read files."""
+        expert = CountingExpert()
+        paths = []
+        for index in range(SCAN_CACHE_SIZE + 1):
+            path = tmp_path / f"{index}.cfg"
+            path.write_text(str(index))
+            paths.append(path)
+
+        for path in paths:
+            await expert._read_cached(path, Path.read_text)
+
+        assert len(expert._file_cache) == SCAN_CACHE_SIZE
+        assert (str(paths[0]), Path.read_text, ()) not in expert._file_cache
+
+
+class TestCalculateConfidence:
+    """Test confidence scoring."""
+
+    def test_no_findings(self):
+        """Test an empty finding list gives high confidence."""
+        assert CountingExpert().calculate_confidence([]) == 0.9
+
+    def test_penalizes_by_priority(self):
+        """Test high and critical findings lower confidence."""
+        findings = [
+            {"priority": "high"},
+            {"priority": "critical"},
+            {"priority": "medium"},
+        ]
+
+        assert CountingExpert().calculate_confidence(findings) == pytest.approx(0.5)
+
+
+class TestFinding:
+    """Test the Finding record."""
+
+    def test_reads_like_a_dict(self):
+        """Test findings support the mapping access callers already use."""
+        finding = Finding(
+            type="build_failure",
+            file="build.log",
+            description="Build errors found in logs",
+            priority="high",
+            tool="build_expert",
+            source="build_log_analysis",
+        )
+
+        assert finding["type"] == "build_failure"
+        assert finding.get("priority") == "high"
+        assert finding.get("missing") is None
+        assert dict(finding) == finding.to_dict()
+        assert finding == finding.to_dict()
+        assert json.loads(json.dumps(finding.to_dict())) == finding
+        assert not hasattr(finding, "__dict__")
+
+    def test_lint_finding_adds_location(self):
+        """Test lint findings expose their line, column and code as keys."""
+        finding = LintFinding(
+            type="code_quality_issue",
+            file="a.py",
+            description="E501 line too long",
+            priority="medium",
+            tool="flake8",
+            source="existing_output",
+            line=1,
+            column=80,
+            code="E501",
+        )
+
+        assert finding["code"] == "E501"
+        assert {"line", "column", "code", "type"} <= set(finding)
+        assert not hasattr(finding, "__dict__")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,89 @@
+"""
+Tests for the CodeQualityExpert agent.
+"""
+
+import json
+
+import pytest
+
+from clewcrew_agents import code_quality_expert as code_quality_expert_module
+from clewcrew_agents.code_quality_expert import CodeQualityExpert
+
+
+class TestCodeQualityExpert:
+    """Test the CodeQualityExpert class."""
+
+    @pytest.fixture
+    def code_quality_expert(self):
+        """Create a test code quality expert."""
+        return CodeQualityExpert()
+
+    @pytest.mark.asyncio
+    async def test_ci_config_change_invalidates_cache(
+        self, code_quality_expert, tmp_path
+    ):
+        """Test editing a CI workflow is picked up by the next scan."""
+        workflows = tmp_path / ".github" / "workflows"
+        workflows.mkdir(parents=True)
+        ci_config = workflows / "ci.yml"
+        ci_config.write_text("steps:\n  - run: pytest\n")
+
+        first = await code_quality_expert.detect_hallucinations(tmp_path)
+        ci_config.write_text("steps:\n  - run: flake8 .\n")
+        second = await code_quality_expert.detect_hallucinations(tmp_path)
+
+        assert first.hallucinations == []
+        assert [h["type"] for h in second.hallucinations] == ["ci_quality_integration"]
+
+    @pytest.mark.asyncio
+    async def test_ci_artifacts_in_build_dirs(self, code_quality_expert, tmp_path):
+        """Test CI configs under build/ inside a CI directory are analyzed."""
+        build_dir = tmp_path / "ci" / "build"
+        build_dir.mkdir(parents=True)
+        (build_dir / "quality.yml").write_text("steps:\n  - run: mypy src\n")
+
+        result = await code_quality_expert.detect_hallucinations(tmp_path)
+
+        assert [h["file"] for h in result.hallucinations] == [
+            str(build_dir / "quality.yml")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_ci_dirs_walked_once_per_scan(
+        self, code_quality_expert, tmp_path, monkeypatch
+    ):
+        """Test the scan reuses the CI walk made for its cache key."""
+        (tmp_path / "ci").mkdir()
+        (tmp_path / "ci" / "quality.yml").write_text("steps:\n  - run: mypy src\n")
+        walks = []
+        walk_ci_dirs = code_quality_expert_module._walk_ci_dirs
+
+        def counting_walk(root, top):
+            walks.append(root)
+            return walk_ci_dirs(root, top)
+
+        monkeypatch.setattr(code_quality_expert_module, "_walk_ci_dirs", counting_walk)
+        result = await code_quality_expert.detect_hallucinations(tmp_path)
+
+        assert len(result.hallucinations) == 1
+        assert walks == [str(tmp_path)]
+
+    @pytest.mark.asyncio
+    async def test_quality_metrics_are_serializable(
+        self, code_quality_expert, tmp_path
+    ):
+        """Test the issues in the quality metrics are plain dicts."""
+        (tmp_path / "flake8_report.txt").write_text(
+            "src/app.py:3:80: E501 line too long (91 > 79 characters)\n"
+        )
+        (tmp_path / "pyproject.toml").write_text("[tool.black]\nline-length = 88\n")
+
+        metrics = await code_quality_expert.generate_quality_metrics(tmp_path)
+
+        assert metrics["flake8_issues"][0]["code"] == "E501"
+        assert metrics["code_style_issues"][0]["tool"] == "black"
+        json.dumps(metrics)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,123 @@
+"""
+Tests for the file reading helpers.
+"""
+
+import re
+
+import pytest
+
+from clewcrew_agents import _io
+
+
+class TestFileContainsAny:
+    """Test the streaming substring scanner."""
+
+    def test_finds_needles_case_insensitively(self, tmp_path):
+        """Test needles are matched regardless of case."""
+        log = tmp_path / "build.log"
+        log.write_bytes(b"step 1 ok\nstep 2 FAILED\n")
+
+        found = _io.file_contains_any(log, (b"error", b"failed"))
+
+        assert found == {b"error": False, b"failed": True}
+
+    def test_needle_split_across_chunks(self, tmp_path, monkeypatch):
+        """Test a needle straddling a chunk boundary is still found."""
+        monkeypatch.setattr(_io, "CHUNK_SIZE", 8)
+        log = tmp_path / "build.log"
+        log.write_bytes(b"x" * 6 + b"error" + b"y" * 20)
+
+        found = _io.file_contains_any(log, (b"error",))
+
+        assert found == {b"error": True}
+
+    @pytest.mark.asyncio
+    async def test_missing_file(self, tmp_path):
+        """Test a missing file is reported as None."""
+        assert await _io.contains_any_async(tmp_path / "nope.log", (b"error",)) is None
+
+
+class TestFileSearch:
+    """Test the streaming regex scanner."""
+
+    def test_match_split_across_chunks(self, tmp_path, monkeypatch):
+        """Test a match straddling a chunk boundary is still found."""
+        monkeypatch.setattr(_io, "CHUNK_SIZE", 8)
+        log = tmp_path / "build.log"
+        log.write_bytes(b"x" * 5 + b"Failed" + b"y" * 20)
+
+        assert _io.file_search(log, re.compile(rb"error|failed", re.IGNORECASE))
+
+    def test_no_match(self, tmp_path):
+        """Test a clean file does not match."""
+        log = tmp_path / "build.log"
+        log.write_bytes(b"all good\n" * 100)
+
+        assert not _io.file_search(log, re.compile(rb"error|failed", re.IGNORECASE))
+
+
+class TestFileMatchGroups:
+    """Test the named-group keyword scanner."""
+
+    def test_reports_matched_groups(self, tmp_path):
+        """Test only the groups present in the file are reported."""
+        config = tmp_path / "pyproject.toml"
+        config.write_bytes(b"[tool.Black]\nline-length = 88\n")
+        pattern = re.compile(rb"(?P<tool>(?i:black))|(?P<option>line-length)|(?P<other>mypy)")
+
+        assert _io.file_match_groups(config, pattern) == {"tool", "option"}
+
+    def test_empty_file(self, tmp_path):
+        """Test an empty file, which cannot be mapped, matches nothing."""
+        config = tmp_path / "empty.toml"
+        config.write_bytes(b"")
+
+        assert _io.file_match_groups(config, re.compile(rb"(?P<tool>black)")) == set()
+
+    def test_ignores_unnamed_alternatives(self, tmp_path):
+        """Test a match outside any named group is not reported."""
+        config = tmp_path / "setup.cfg"
+        config.write_bytes(b"[flake8]\n")
+        pattern = re.compile(rb"(?P<tool>black)|flake8")
+
+        assert _io.file_match_groups(config, pattern) == set()
+
+
+class TestIterJsonArray:
+    """Test the JSON array reader."""
+
+    def test_yields_items(self, tmp_path):
+        """Test each array element is yielded in order."""
+        report = tmp_path / "flake8_report.json"
+        report.write_text('[{"code": "E501"}, {"code": "W291"}]')
+
+        assert [item["code"] for item in _io.iter_json_array(report)] == ["E501", "W291"]
+
+
+class TestIterPrefetched:
+    """Test the prefetching file iterator."""
+
+    @pytest.mark.asyncio
+    async def test_yields_in_order(self, tmp_path):
+        """Test results come back in input order with errors in place."""
+        paths = []
+        for i in range(5):
+            path = tmp_path / f"{i}.log"
+            path.write_text(str(i))
+            paths.append(path)
+        paths.insert(2, tmp_path / "missing.log")
+
+        results = [
+            (path, result)
+            async for path, result in _io.iter_prefetched(
+                paths, lambda p: p.read_text(), concurrency=2
+            )
+        ]
+
+        assert [path for path, _ in results] == paths
+        assert [r for _, r in results if isinstance(r, str)] == ["0", "1", "2", "3", "4"]
+        assert isinstance(results[2][1], FileNotFoundError)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,98 @@
+"""
+Tests for the declarative rule engine.
+"""
+
+import pytest
+
+from clewcrew_agents.base_expert import BaseExpert, HallucinationResult
+from clewcrew_agents.rule_engine import LOG_ERRORS, Rule, RuleEngine
+
+
+class PlainExpert(BaseExpert):
+    """Minimal expert used as the engine's file cache and logger."""
+
+    async def detect_hallucinations(self, project_path):
+        return HallucinationResult(hallucinations=[], confidence=0.9, recommendations=[])
+
+
+ENGINE = RuleEngine([
+    Rule(
+        issue_type="black_config",
+        files=("pyproject.toml",),
+        pattern=rb"(?P<tool>(?i:black))|(?P<option>line-length)",
+        required=frozenset({"tool", "option"}),
+        description="Black configured",
+        priority="low",
+        tool="black",
+        source="existing_config",
+        fix="Configure Black",
+        fix_priority="low",
+    ),
+    Rule(
+        issue_type="mypy_unconfigured",
+        files=("pyproject.toml",),
+        pattern=rb"(?P<tool>(?i:mypy))|(?P<option>strict)",
+        required=frozenset({"tool"}),
+        forbidden=frozenset({"option"}),
+        description="MyPy mentioned but not configured",
+        priority="medium",
+        tool="mypy",
+        source="existing_config",
+        fix="Configure MyPy",
+    ),
+    Rule(
+        issue_type="log_failure",
+        files=("app.log",),
+        pattern=LOG_ERRORS,
+        required=frozenset({"error"}),
+        description="Log contains errors",
+        priority="high",
+        tool="logs",
+        source="existing_logs",
+        fix="Fix failures",
+        fix_description="Review the failures in the log",
+    ),
+])
+
+
+class TestRuleEngine:
+    """Test running rules and mapping their findings to fixes."""
+
+    @pytest.mark.asyncio
+    async def test_rules_sharing_a_file(self, tmp_path):
+        """Test every rule reading one file is evaluated from a single pass."""
+        (tmp_path / "pyproject.toml").write_text(
+            "[tool.black]\nline-length = 88\n[tool.MyPy]\n"
+        )
+        (tmp_path / "app.log").write_text("ok\nFAILED\n")
+
+        findings = await ENGINE.run(PlainExpert(), tmp_path)
+
+        assert [f["type"] for f in findings] == [
+            "black_config", "mypy_unconfigured", "log_failure",
+        ]
+        assert findings[2]["file"] == str(tmp_path / "app.log")
+
+    @pytest.mark.asyncio
+    async def test_forbidden_group_suppresses_finding(self, tmp_path):
+        """Test a rule does not fire when a forbidden group matches."""
+        (tmp_path / "pyproject.toml").write_text("[tool.mypy]\nstrict = true\n")
+
+        assert await ENGINE.run(PlainExpert(), tmp_path) == []
+
+    def test_fix_for(self):
+        """Test fixes come from the rule that raised the finding."""
+        issue = {"type": "log_failure", "description": "Log contains errors", "priority": "high"}
+
+        fix = ENGINE.fix_for(issue)
+
+        assert fix["fix"] == "Fix failures"
+        assert fix["description"] == "Review the failures in the log"
+        assert fix["priority"] == "high"
+        assert fix["source"] == "existing_logs"
+        assert ENGINE.fix_for({"type": "unknown"}) is None
+        assert ENGINE.suggest_fixes([issue, {"type": "unknown"}]) == [fix]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
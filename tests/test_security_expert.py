@@ -2,6 +2,9 @@
 Tests for the SecurityExpert agent.
 """
 
+import json
+import os
+
 import pytest
 
 from clewcrew_agents.security_expert import SecurityExpert
@@ -67,6 +70,20 @@ def main():
         assert "sk-" in result.hallucinations[0]["pattern"]
         assert result.confidence < 0.9  # Should be lower due to security issues
 
+    @pytest.mark.asyncio
+    async def test_credential_prefix_needs_full_token(self, security_expert, tmp_path):
+        """Test a credential prefix only counts when a full token follows it."""
+        test_file = tmp_path / "test.py"
+        test_file.write_text(
+            "name = 'ghp_short'\n"
+            "token = 'ghp_" + "a" * 36 + "'\n"
+        )
+
+        result = await security_expert.detect_hallucinations(tmp_path)
+
+        assert len(result.hallucinations) == 1
+        assert result.hallucinations[0]["line"] == 2
+
     @pytest.mark.asyncio
     async def test_detect_hallucinations_with_subprocess(
         self, security_expert, tmp_path
@@ -90,6 +107,101 @@ def main():
         assert result.hallucinations[0]["type"] == "subprocess_vulnerability"
         assert result.hallucinations[0]["priority"] == "critical"
         assert "subprocess" in result.hallucinations[0]["pattern"]
+        assert result.hallucinations[0]["lines"] == (2, 5)
+        assert result.hallucinations[0]["count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_count_includes_repeated_matches(self, security_expert, tmp_path):
+        """Test every occurrence of a pattern counts, not just the first."""
+        (tmp_path / "once.py").write_text("subprocess.run(['ls'])\n")
+        (tmp_path / "many.py").write_text("subprocess.run(['ls'])\n" * 100)
+        token = "ghp_" + "a" * 36
+        (tmp_path / "keys.py").write_text(f"a = '{token}'\nb = '{token}'\n")
+
+        result = await security_expert.detect_hallucinations(tmp_path)
+
+        counts = {
+            os.path.basename(h["file"]): h["count"] for h in result.hallucinations
+        }
+        assert counts == {"once.py": 1, "many.py": 100, "keys.py": 2}
+        lines = {
+            os.path.basename(h["file"]): h["lines"] for h in result.hallucinations
+        }
+        assert lines["many.py"] == tuple(range(1, 101))
+        assert lines["keys.py"] == (1, 2)
+        keys = [h for h in result.hallucinations if h["file"].endswith("keys.py")]
+        assert security_expert.calculate_risk_score(keys) == 10.0
+
+    @pytest.mark.asyncio
+    async def test_detect_hallucinations_skips_binary(self, security_expert, tmp_path):
+        """Test files with a NUL byte near the start are not scanned."""
+        test_file = tmp_path / "generated.py"
+        test_file.write_bytes(b"\x00\x01import subprocess\nsubprocess.run([])\n")
+
+        result = await security_expert.detect_hallucinations(tmp_path)
+
+        assert result.hallucinations == []
+
+    @pytest.mark.asyncio
+    async def test_scans_nested_build_dirs(self, security_expert, tmp_path):
+        """Test only root-level VCS and virtualenv directories are skipped."""
+        nested = tmp_path / "pkg" / "build"
+        nested.mkdir(parents=True)
+        (nested / "x.py").write_text("token = 'ghp_" + "a" * 36 + "'\n")
+        venv = tmp_path / ".venv"
+        venv.mkdir()
+        (venv / "x.py").write_text("token = 'ghp_" + "b" * 36 + "'\n")
+
+        result = await security_expert.detect_hallucinations(tmp_path)
+
+        assert [h["file"] for h in result.hallucinations] == [str(nested / "x.py")]
+
+    @pytest.mark.asyncio
+    async def test_line_numbers_in_large_file(self, security_expert, tmp_path):
+        """Test hits past the first read chunk get the right line number."""
+        test_file = tmp_path / "big.py"
+        test_file.write_text("x = 1\n" * 50_000 + "os.system('ls')\n")
+
+        result = await security_expert.detect_hallucinations(tmp_path)
+
+        assert [h["line"] for h in result.hallucinations] == [50_001]
+
+    @pytest.mark.asyncio
+    async def test_only_read_errors_are_skipped(
+        self, security_expert, tmp_path, monkeypatch, caplog
+    ):
+        """Test unreadable files are skipped but other scan errors propagate."""
+        for name in ("a.py", "b.py", "c.py"):
+            (tmp_path / name).write_text("x = 1\n")
+
+        def unreadable(py_file):
+            raise PermissionError(13, "Permission denied", py_file)
+
+        monkeypatch.setattr(security_expert, "_scan_file", unreadable)
+        result = await security_expert.detect_hallucinations(tmp_path)
+        assert result.hallucinations == []
+        warnings = [r.getMessage() for r in caplog.records if r.levelname == "WARNING"]
+        assert len(warnings) == 1
+        assert warnings[0].startswith("Could not read 3 files: ")
+
+        def broken(py_file):
+            raise ValueError("bad pattern")
+
+        monkeypatch.setattr(security_expert, "_scan_file", broken)
+        with pytest.raises(ValueError):
+            await security_expert.detect_hallucinations(tmp_path)
+
+    @pytest.mark.asyncio
+    async def test_quality_metrics_are_serializable(self, security_expert, tmp_path):
+        """Test the security issues in the quality metrics are plain dicts."""
+        (tmp_path / "app.py").write_text("import subprocess\n")
+
+        metrics = await security_expert.generate_quality_metrics(tmp_path)
+
+        issue = metrics["security_issues"][0]
+        assert type(issue) is dict
+        assert issue["type"] == "subprocess_vulnerability"
+        json.dumps(metrics)
 
     def test_calculate_risk_score(self, security_expert):
         """Test risk score calculation."""
@@ -109,6 +221,11 @@ def main():
         critical_issues = [{"priority": "critical"}]
         assert security_expert.calculate_risk_score(critical_issues) == 10.0
 
+    def test_risk_score_weights_by_count(self, security_expert):
+        """Test findings with several matches weigh more, up to a cap."""
+        assert security_expert.calculate_risk_score([{"priority": "medium", "count": 3}]) == 6.0
+        assert security_expert.calculate_risk_score([{"priority": "low", "count": 100}]) == 5.0
+
     @pytest.mark.asyncio
     async def test_suggest_fixes(self, security_expert):
         """Test fix suggestions."""
@@ -134,6 +251,10 @@ def main():
         assert fixes[1]["fix"] == "Replace subprocess call with native Python operation"
         assert fixes[0]["priority"] == "high"
         assert fixes[1]["priority"] == "critical"
+        assert fixes[0]["example"] == (
+            "# Replace: sk-1234567890abcdef\n# With: os.getenv('CREDENTIAL_KEY')"
+        )
+        assert await security_expert.suggest_fixes([{"type": "unknown"}]) == []
 
 
 if __name__ == "__main__":